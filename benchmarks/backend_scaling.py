@@ -0,0 +1,50 @@
+"""Scaling of the chunked sampling backends from 1 to N workers.
+
+Run from the repository root:
+
+    python -m benchmarks.backend_scaling [max_workers]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+from experiments.backend import ProcessBackend, SerialBackend, ThreadBackend, run_chunked
+from experiments.accumulators import SampleStats
+from experiments.basic.central_limit import ELEMENTS_PER_CHUNK, sample_mean_edges, sample_means_chunk
+
+NUM_SAMPLES = 20_000
+SAMPLE_SIZE = 1_000
+
+
+def run(backend):
+    edges = sample_mean_edges('Exponential', SAMPLE_SIZE)
+    start = time.perf_counter()
+    SampleStats.merge_all(run_chunked(
+        sample_means_chunk, NUM_SAMPLES, np.random.SeedSequence(0),
+        ELEMENTS_PER_CHUNK // SAMPLE_SIZE,
+        'Exponential', SAMPLE_SIZE, edges, backend=backend,
+    ))
+    return time.perf_counter() - start
+
+
+def main():
+    max_workers = int(sys.argv[1]) if len(sys.argv) > 1 else os.cpu_count() or 1
+    elements = NUM_SAMPLES * SAMPLE_SIZE
+    baseline = run(SerialBackend())
+    print(f'{os.cpu_count()} CPUs, {elements:,} samples per run')
+    print(f'{"serial":8s} {"1":>3s} {baseline:7.3f}s {elements / baseline / 1e6:8.1f} M/s   1.00x')
+
+    for backend_class in (ThreadBackend, ProcessBackend):
+        for workers in range(1, max_workers + 1):
+            backend = backend_class(workers)
+            run(backend)  # warm up the pool
+            seconds = run(backend)
+            backend.shutdown()
+            name = backend_class.__name__.replace('Backend', '').lower()
+            print(f'{name:8s} {workers:3d} {seconds:7.3f}s {elements / seconds / 1e6:8.1f} M/s {baseline / seconds:6.2f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""Import-time profile of the app entry point and every catalog module.
+
+Each module is imported in a fresh interpreter with `python -X importtime`,
+so the numbers are cold-start costs. Run from the repository root:
+
+    python -m benchmarks.importtime [--top 10] [--json importtime.json]
+"""
+import argparse
+import json
+import subprocess
+import sys
+
+from registry import Registry
+
+
+def catalog_modules():
+    """Entry points plus the module behind every registered distribution and experiment"""
+    modules = ['main', 'registry', 'distributions.compute']
+    for spec in Registry().specs():
+        modules.append(spec.target.partition(':')[0])
+    return modules
+
+
+def profile(module):
+    """Map of imported module -> (depth, self µs, cumulative µs) for a cold `import module`"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f'importing {module} failed:\n{result.stderr}')
+
+    timings = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # importtime indents nested imports by two spaces per level
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        timings[name.strip()] = (depth, int(self_us), int(cumulative_us))
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--top', type=int, default=5, help='heaviest top-level imports to list per module')
+    parser.add_argument('--json', help='also write the report to this file')
+    args = parser.parse_args(argv)
+
+    report = {}
+    for module in catalog_modules():
+        timings = profile(module)
+        # Direct imports of the profiled module, heaviest first
+        heaviest = sorted(
+            ((name, cumulative) for name, (depth, _, cumulative) in timings.items() if depth == 1),
+            key=lambda item: item[1], reverse=True,
+        )[:args.top]
+        report[module] = {
+            'cumulative_ms': timings[module][2] / 1e3,
+            'heaviest': {name: cumulative / 1e3 for name, cumulative in heaviest},
+        }
+
+    for module, entry in report.items():
+        heaviest = ', '.join(f'{name} {ms:.0f}' for name, ms in entry['heaviest'].items())
+        print(f"{module:45s} {entry['cumulative_ms']:8.1f} ms   {heaviest}")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""Compare the old fixed mgrid evaluation of the bivariate normal with the adaptive grid.
+
+Run from the repository root:
+
+    python -m benchmarks.multivariate_normal
+"""
+import time
+import tracemalloc
+
+import numpy as np
+from scipy.stats import multivariate_normal
+
+from distributions.compute import multivariate_normal_grid
+
+MEAN = [0.5, -0.5]
+COV = np.array([[2.0, 0.8], [0.8, 1.0]])
+REPEATS = 5
+
+
+def fixed_grid():
+    x, y = np.mgrid[-5:5:.01, -5:5:.01]
+    pos = np.dstack((x, y))
+    return x, y, multivariate_normal(MEAN, COV).pdf(pos)
+
+
+def adaptive_grid():
+    return multivariate_normal_grid(MEAN, COV)
+
+
+def measure(func):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return min(timings), peak
+
+
+def main():
+    results = {name: measure(func) for name, func in [('fixed mgrid', fixed_grid), ('adaptive', adaptive_grid)]}
+    for name, (seconds, peak) in results.items():
+        print(f'{name:12s} {seconds * 1e3:9.2f} ms  {peak / 2**20:9.2f} MiB peak')
+
+    (old_time, old_peak), (new_time, new_peak) = results.values()
+    print(f'speedup {old_time / new_time:.1f}x, peak memory {old_peak / new_peak:.1f}x lower')
+
+
+if __name__ == '__main__':
+    main()
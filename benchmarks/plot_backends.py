@@ -0,0 +1,50 @@
+"""Server CPU per plot for the matplotlib and vega-lite backends.
+
+For every distribution at its default parameters, times the work the server
+does per rerun: a PNG from matplotlib (as st.pyplot produces it) versus a
+JSON Vega-Lite spec. Run from the repository root:
+
+    python -m benchmarks.plot_backends [repeats]
+
+Densities come from the evaluation cache after the first call, so the
+numbers isolate rendering.
+"""
+import json
+import logging
+import sys
+import time
+
+from registry import Registry
+from ui.render_cache import render
+from ui.vega import VegaFigure
+
+
+def vega_spec(distribution):
+    fig = VegaFigure()
+    distribution.plot(fig.add_subplot())
+    return json.dumps(fig.axes.spec()).encode()
+
+
+def cpu_time(fn, repeats):
+    start = time.process_time()
+    for _ in range(repeats):
+        payload = fn()
+    return (time.process_time() - start) / repeats, len(payload)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    logging.disable(logging.WARNING)  # get_parameters() runs without a Streamlit session
+    registry = Registry()
+    print(f'{"distribution":20s} {"matplotlib":>10s} {"PNG":>9s} {"vega-lite":>10s} {"spec":>9s} {"speedup":>8s}')
+    for name in registry.names('continuous') + registry.names('discrete'):
+        distribution = registry.distribution_class(name)()
+        distribution.get_parameters()
+        png_seconds, png_bytes = cpu_time(lambda: render(distribution), repeats)
+        vega_seconds, vega_bytes = cpu_time(lambda: vega_spec(distribution), repeats)
+        print(f'{name:20s} {png_seconds * 1e3:8.1f}ms {png_bytes / 1024:7.1f}KiB '
+              f'{vega_seconds * 1e3:8.1f}ms {vega_bytes / 1024:7.1f}KiB {png_seconds / vega_seconds:7.0f}x')
+
+
+if __name__ == '__main__':
+    main()
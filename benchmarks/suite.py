@@ -0,0 +1,256 @@
+"""Benchmark suite for distribution plots and experiment compute cores.
+
+Every Distribution.plot is run on a headless Agg figure at its default
+parameters and with each slider moved to its minimum and maximum. Every
+experiment's compute function is run over a range of sizes up to its slider
+limits. Each case records its wall time (best and median of several runs),
+peak traced memory, and the bytes and blocks it leaves allocated (cache
+entries, leaks). Run from the repository root:
+
+    python -m benchmarks.suite run [-k Binomial] [--output before.json]
+    python -m benchmarks.suite compare before.json after.json [--threshold 0.2]
+
+compare exits with status 1 when a case got slower or peaked higher than
+the threshold allows, so it can gate a change in CI.
+"""
+import argparse
+import gc
+import json
+import logging
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+import numpy as np
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from distributions.base import evaluation_cache
+from distributions.compute import clear_caches
+from registry import Registry
+
+SCHEMA = 1
+# Differences below these are noise whatever the ratio
+MIN_SECONDS = 1e-3
+MIN_BYTES = 64 * 2**10
+
+
+@dataclass
+class Case:
+    """A named benchmark: setup() returns the function to measure, reset() runs untimed before every call"""
+    name: str
+    setup: callable
+    reset: callable = None
+
+
+def reset_caches():
+    evaluation_cache.clear()
+    clear_caches()
+
+
+def plot_cases(registry):
+    """Each distribution at its defaults, with one slider at a time at its minimum and maximum, and with all of them there"""
+    for name in registry.names('continuous') + registry.names('discrete'):
+        cls = registry.distribution_class(name)
+        variants = [('default', {})]
+        for parameter in cls.parameters:
+            variants.append((f'{parameter.name}=min', {parameter.name: parameter.min_value}))
+            variants.append((f'{parameter.name}=max', {parameter.name: parameter.max_value}))
+        if len(cls.parameters) > 1:
+            variants.append(('all=min', {parameter.name: parameter.min_value for parameter in cls.parameters}))
+            variants.append(('all=max', {parameter.name: parameter.max_value for parameter in cls.parameters}))
+        for label, values in variants:
+            yield Case(f'plot/{name}/{label}', lambda cls=cls, values=values: plot_function(cls, values), reset_caches)
+
+
+def plot_function(cls, values):
+    distribution = cls()
+    defaults = {parameter.name: parameter.value for parameter in cls.parameters}
+    distribution.assumed_values = {**defaults, **values}
+    distribution.get_parameters()
+
+    def plot():
+        fig = Figure()
+        FigureCanvasAgg(fig)
+        distribution.plot(fig.add_subplot())
+    return plot
+
+
+def experiment_cases():
+    from experiments.backend import SerialBackend, run_chunked
+    from experiments.basic import central_limit, coin_flip, dice_experiment, markov_chain, monte_carlo_pi, random_walk, t_test
+
+    def rng():
+        return np.random.default_rng(0)
+
+    def central_limit_means(num_samples, sample_size):
+        edges = central_limit.sample_mean_edges('Exponential', sample_size)
+        return list(run_chunked(
+            central_limit.sample_means_chunk, num_samples, np.random.SeedSequence(0),
+            max(1, central_limit.ELEMENTS_PER_CHUNK // sample_size),
+            'Exponential', sample_size, edges, backend=SerialBackend(),
+        ))
+
+    for num_flips, p in ((1, 0.5), (10_000, 0.5), (10**9, 0.5), (10**8, 0.3)):
+        yield Case(f'experiment/coin_flip/flips={num_flips},p={p}',
+                   lambda n=num_flips, p=p: lambda: coin_flip.flip_coins(n, rng(), p))
+    def dice(num_rolls, num_dice, faces):
+        probabilities = dice_experiment.face_probabilities(faces)
+        dice_experiment.sum_distribution(probabilities, num_dice)
+        return dice_experiment.roll_dice(num_rolls, probabilities, num_dice, np.random.SeedSequence(0), SerialBackend())
+
+    for num_rolls, num_dice, faces in ((100, 1, 6), (10**6, 4, 6), (10**5, 500, 100), (10**7, 2, 6)):
+        yield Case(f'experiment/dice/rolls={num_rolls},dice={num_dice},faces={faces}',
+                   lambda r=num_rolls, d=num_dice, f=faces: lambda: dice(r, d, f),
+                   dice_experiment.sum_distribution.cache_clear)
+    for sample_size in (10, 100, 1000):
+        yield Case(f'experiment/t_test/size={sample_size}',
+                   lambda n=sample_size: lambda: t_test.two_sample_t_test(n, 0.5, rng()))
+    for max_sample_size, num_replications in ((100, 1000), (1000, 1000), (1000, 10000)):
+        yield Case(f'experiment/t_test_power/max_size={max_sample_size},replications={num_replications}',
+                   lambda m=max_sample_size, r=num_replications: lambda: t_test.simulated_power(
+                       *t_test.power_grid(m, 1.0), 0.05, r, np.random.SeedSequence(0), SerialBackend()))
+    for num_steps, num_walks, dims in ((10, 1, 1), (100, 10, 1), (1000, 100, 1), (10**5, 1000, 1), (10**4, 1000, 3)):
+        yield Case(f'experiment/random_walk/steps={num_steps},walks={num_walks},dims={dims}',
+                   lambda s=num_steps, w=num_walks, d=dims: lambda: random_walk.simulate_walks(
+                       w, s, np.random.SeedSequence(0), d, backend=SerialBackend()))
+    for num_samples, sample_size in ((100, 1), (1000, 30), (10**6, 30), (1000, 5000)):
+        yield Case(f'experiment/central_limit/samples={num_samples},size={sample_size}',
+                   lambda n=num_samples, s=sample_size: lambda: central_limit_means(n, s))
+    for num_points in (10**2, 10**6, 10**9):
+        yield Case(f'experiment/monte_carlo_pi/points={num_points}',
+                   lambda n=num_points: lambda: monte_carlo_pi.estimate_pi(n, rng=rng()))
+    for num_states, num_steps, num_chains in ((3, 100, 1), (3, 10_000, 1), (8, 10_000, 1000)):
+        yield Case(f'experiment/markov_chain/states={num_states},steps={num_steps},chains={num_chains}',
+                   lambda k=num_states, s=num_steps, c=num_chains: lambda: markov_chain.simulate_markov_chains(
+                       markov_chain.default_transition_matrix(k), s, c, rng=rng()))
+
+
+def all_cases():
+    yield from plot_cases(Registry())
+    yield from experiment_cases()
+
+
+def measure(case, repeats, budget):
+    """Timings over up to `repeats` runs (fewer once `budget` seconds are spent), then one traced run"""
+    fn = case.setup()
+    reset = case.reset or (lambda: None)
+    timings = []
+    while len(timings) < repeats and sum(timings) < budget:
+        reset()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+
+    reset()
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    fn()
+    _, peak = tracemalloc.get_traced_memory()
+    gc.collect()  # figures are reference cycles; only count what stays reachable
+    retained = tracemalloc.take_snapshot().compare_to(before, 'filename')
+    tracemalloc.stop()
+    return {
+        'seconds': min(timings),
+        'median_seconds': statistics.median(timings),
+        'runs': len(timings),
+        'peak_bytes': peak,
+        'retained_bytes': sum(stat.size_diff for stat in retained),
+        'retained_blocks': sum(stat.count_diff for stat in retained),
+    }
+
+
+def metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = ''
+    return {
+        'schema': SCHEMA,
+        'created': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'commit': commit or None,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'machine': platform.platform(),
+    }
+
+
+def run(args):
+    # get_parameters() runs outside a Streamlit session here, where its st calls are no-ops
+    logging.disable(logging.WARNING)
+    results = {}
+    for case in all_cases():
+        if args.k and args.k not in case.name:
+            continue
+        try:
+            result = measure(case, args.repeats, args.budget)
+        except (ValueError, RuntimeError) as e:
+            # Extremes outside a dependent bound, e.g. K > N for the hypergeometric
+            print(f'{case.name:60s} skipped: {e}')
+            continue
+        results[case.name] = result
+        print(f"{case.name:60s} {result['seconds'] * 1e3:10.2f}ms {result['peak_bytes'] / 2**20:9.2f}MiB "
+              f"{result['retained_bytes'] / 2**10:9.1f}KiB {result['retained_blocks']:7d} blocks")
+    report = {'meta': metadata(), 'cases': results}
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f'{len(results)} cases written to {args.output}')
+
+
+def compare(args):
+    with open(args.baseline) as f:
+        baseline = json.load(f)['cases']
+    with open(args.candidate) as f:
+        candidate = json.load(f)['cases']
+
+    regressions = 0
+    print(f'{"case":60s} {"time":>10s} {"ratio":>7s} {"peak":>10s} {"ratio":>7s}')
+    for name in sorted(baseline.keys() & candidate.keys()):
+        old, new = baseline[name], candidate[name]
+        time_ratio = new['seconds'] / max(old['seconds'], 1e-12)
+        peak_ratio = new['peak_bytes'] / max(old['peak_bytes'], 1)
+        slower = time_ratio > 1 + args.threshold and new['seconds'] - old['seconds'] > MIN_SECONDS
+        bigger = peak_ratio > 1 + args.threshold and new['peak_bytes'] - old['peak_bytes'] > MIN_BYTES
+        regressions += slower or bigger
+        flag = ' REGRESSION' if slower or bigger else ''
+        print(f"{name:60s} {new['seconds'] * 1e3:8.2f}ms {time_ratio:6.2f}x "
+              f"{new['peak_bytes'] / 2**20:7.2f}MiB {peak_ratio:6.2f}x{flag}")
+    only_baseline, only_candidate = len(baseline.keys() - candidate.keys()), len(candidate.keys() - baseline.keys())
+    if only_baseline or only_candidate:
+        print(f'not compared: {only_baseline} case(s) only in {args.baseline}, {only_candidate} only in {args.candidate}')
+    print(f'{regressions} regression(s) beyond {args.threshold:.0%}')
+    return 1 if regressions else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help='run the benchmarks')
+    run_parser.add_argument('-k', help='only cases whose name contains this string')
+    run_parser.add_argument('--output', help='write results to this JSON file')
+    run_parser.add_argument('--repeats', type=int, default=5, help='timed runs per case')
+    run_parser.add_argument('--budget', type=float, default=2.0, help='seconds after which a case stops repeating')
+
+    compare_parser = commands.add_parser('compare', help='flag regressions between two result files')
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('candidate')
+    compare_parser.add_argument('--threshold', type=float, default=0.2, help='allowed relative slowdown or growth')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        run(args)
+        return 0
+    return compare(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,7 +1,47 @@
 from abc import ABC, abstractmethod
+from dataclasses import dataclass, replace
+import numpy as np
 import streamlit as st
+from instrumentation import phase
+from .compute import LRUCache, bar_widths, freeze, get_model
+
+
+class EvaluationCache(LRUCache):
+    """LRU cache of evaluated x/y arrays shared by every Distribution, sized by their total nbytes"""
+
+    def prepare(self, value):
+        """The value to store for a compute() result, made read-only, and its size in bytes"""
+        arrays = tuple(np.asarray(a) for a in value)
+        for array in arrays:
+            array.setflags(write=False)
+        return arrays, sum(array.nbytes for array in arrays)
+
+
+evaluation_cache = EvaluationCache()
+
+
+@dataclass(frozen=True)
+class Parameter:
+    """Slider schema for one parameter, readable without instantiating the Distribution"""
+    name: str
+    label: str
+    min_value: float
+    max_value: float
+    value: float
+    step: float = None
+
 
 class Distribution(ABC):
+    # Name of the compute-layer model in distributions.compute.MODELS
+    model = None
+    # Parameter schema, one Parameter per slider, in display order
+    parameters = ()
+
+    def __init__(self):
+        # Last value of every slider, and values to use in place of the widgets
+        self.slider_values = {}
+        self.assumed_values = {}
+
     @abstractmethod
     def get_parameters(self):
         """Get distribution parameters from user input"""
@@ -21,3 +61,44 @@ class Distribution(ABC):
     def get_properties(self, st):
         """Return distribution properties"""
         pass
+
+    def evaluate(self, compute, params, grid=None):
+        """Return the arrays produced by compute(), cached on (class, params, grid)"""
+        key = (type(self).__name__, freeze(params), freeze(grid))
+        return evaluation_cache.get_or_compute(key, compute)
+
+    def evaluate_model(self, params, **grid):
+        """Plot arrays from the compute layer, cached like evaluate()"""
+        model = get_model(self.model)
+        with phase('evaluate'):
+            return self.evaluate(lambda: model.density(**params, **grid), params, grid or None)
+
+    @staticmethod
+    def bar_width(x):
+        """Widths for bars at evaluate_model() pmf x values, which may each sum several k"""
+        spacing = x[1] - x[0] if len(x) > 1 else 1
+        return 0.8 if spacing == 1 else bar_widths(x)
+
+    def slider(self, name, **overrides):
+        """Render the slider declared for name; overrides replace schema fields such as dependent bounds.
+
+        Values in assumed_values are used instead of a widget (e.g. to render
+        off-screen), and must lie within the overridden bounds.
+        """
+        parameter = replace(self.parameter(name), **overrides)
+        if name in self.assumed_values:
+            value = self.assumed_values[name]
+            if not parameter.min_value <= value <= parameter.max_value:
+                raise ValueError(f"{parameter.label} = {value} is outside "
+                                 f"[{parameter.min_value}, {parameter.max_value}]")
+        else:
+            value = st.slider(parameter.label, parameter.min_value, parameter.max_value,
+                              parameter.value, parameter.step)
+        self.slider_values[name] = value
+        return value
+
+    def parameter(self, name):
+        for parameter in self.parameters:
+            if parameter.name == name:
+                return parameter
+        raise ValueError(f"{type(self).__name__} has no parameter {name!r}")
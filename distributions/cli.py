@@ -0,0 +1,129 @@
+"""Evaluate distributions in batch, without Streamlit.
+
+    python -m distributions.cli jobs.json -o results.npz
+    python -m distributions.cli sweep.csv -o results.parquet
+
+A JSON job file holds a list of jobs (or {"jobs": [...]}), each like
+
+    {"distribution": "normal", "params": {"mean": 0, "std": 1},
+     "x": [-1, 0, 1], "quantiles": [0.05, 0.5, 0.95]}
+
+where "x" (default: the plotting grid) and "quantiles" are optional. A job
+with "properties": true tabulates moments, entropy, quantiles and support
+instead (see distributions/properties.py); its parameters may then be
+arrays, broadcast against each other, e.g. {"n": [[10], [20]], "p": [0.1, 0.5]}.
+A CSV job file has a "distribution" column, one column per parameter and
+optional "x"/"quantiles" columns; every row is a job. Cells are parsed as
+JSON, so vector parameters such as multinomial p are written as [0.2, 0.3, 0.5].
+
+Writing Parquet needs pyarrow; .npz output only needs numpy.
+"""
+import argparse
+import csv
+import json
+import sys
+import numpy as np
+from .compute import MODELS, get_model
+from .properties import QUANTILES, tabulate
+
+JOB_OPTIONS = ('x', 'quantiles')
+
+
+def _parse_cell(value):
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+def load_jobs(path):
+    if path.endswith('.csv'):
+        with open(path, newline='') as f:
+            jobs = []
+            for row in csv.DictReader(f):
+                values = {key: _parse_cell(value) for key, value in row.items() if value not in ('', None)}
+                job = {'distribution': values.pop('distribution')}
+                for option in JOB_OPTIONS + ('properties',):
+                    if option in values:
+                        job[option] = values.pop(option)
+                job['params'] = values
+                jobs.append(job)
+            return jobs
+
+    with open(path) as f:
+        jobs = json.load(f)
+    return jobs['jobs'] if isinstance(jobs, dict) else jobs
+
+
+def run_jobs(jobs):
+    """Evaluate every job, returning a list of (job, {name: array}) pairs"""
+    results = []
+    for job in jobs:
+        if job.get('properties'):
+            result = tabulate(job['distribution'], job.get('quantiles', QUANTILES), **job['params'])
+            result['support_low'], result['support_high'] = result.pop('support')
+            results.append((job, result))
+            continue
+        model = get_model(job['distribution'])
+        options = {option: job[option] for option in JOB_OPTIONS if option in job}
+        results.append((job, model.evaluate(**options, **job['params'])))
+    return results
+
+
+def write_npz(results, path):
+    arrays = {'jobs': np.array([json.dumps(job) for job, _ in results])}
+    for i, (_, result) in enumerate(results):
+        for name, array in result.items():
+            arrays[f'job{i}_{name}'] = array
+    np.savez_compressed(path, **arrays)
+
+
+def write_parquet(results, path):
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:
+        raise SystemExit('Writing Parquet requires pyarrow (pip install pyarrow)')
+
+    # One row per (job, array) so arrays of any shape share a single schema
+    rows = []
+    for i, (job, result) in enumerate(results):
+        for name, array in result.items():
+            array = np.asarray(array, dtype=float)
+            rows.append({
+                'job': i,
+                'distribution': job['distribution'],
+                'params': json.dumps(job['params']),
+                'array': name,
+                'shape': list(array.shape),
+                'values': array.ravel().tolist(),
+            })
+    pq.write_table(pa.Table.from_pylist(rows), path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Evaluate distributions from a JSON/CSV job file.')
+    parser.add_argument('jobs', nargs='?', help='JSON or CSV job file')
+    parser.add_argument('-o', '--output', help='.npz or .parquet output file')
+    parser.add_argument('--list', action='store_true', help='list distributions and their parameters')
+    args = parser.parse_args(argv)
+
+    if args.list:
+        for name, model in MODELS.items():
+            print(f"{name:20s} {model.kind:13s} {', '.join(model.params)}")
+        return
+    if not args.jobs or not args.output:
+        parser.error('a job file and --output are required')
+
+    results = run_jobs(load_jobs(args.jobs))
+    if args.output.endswith('.parquet'):
+        write_parquet(results, args.output)
+    elif args.output.endswith('.npz'):
+        write_npz(results, args.output)
+    else:
+        parser.error('output must end in .npz or .parquet')
+    print(f'{len(results)} jobs written to {args.output}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,538 @@
+"""Pure numeric layer for every distribution in the explorer.
+
+Nothing here imports streamlit or matplotlib, so batch jobs (see
+distributions/cli.py) can evaluate densities, CDFs and quantiles for large
+parameter sweeps without pulling in the UI. The Streamlit Distribution
+classes call into MODELS for their plot data.
+
+scipy submodules are imported on first use: scipy.stats alone takes over a
+second to import, and most reruns only need one family. The models reach it
+as scipy.stats, which scipy loads on first attribute access.
+"""
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from itertools import combinations
+import threading
+import numpy as np
+import scipy
+
+# Continuous densities are drawn on GRID_POINTS points placed by plan_grid
+GRID_POINTS = 256
+GRID_TAIL = 1e-4
+GRID_IQR_SPAN = 5
+GRID_PAD = 0.05
+GRID_CACHE_SIZE = 512
+# Discrete pmfs are evaluated over the window holding all but 2·PMF_TAIL of the
+# mass, and summed into at most MAX_BARS bars for display
+PMF_TAIL = 1e-12
+MAX_BARS = 200
+
+
+def freeze(value):
+    """Turn params/grid specs into something hashable for cache keys"""
+    if isinstance(value, np.ndarray):
+        return (value.shape, tuple(value.ravel().tolist()))
+    if isinstance(value, dict):
+        return tuple(sorted((k, freeze(v)) for k, v in value.items()))
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+class LRUCache:
+    """Thread-safe LRU cache, shared by the Streamlit reruns that run in parallel.
+
+    Entries are evicted least-recently-used first once either max_entries or
+    max_bytes (total of the sizes prepare() reports) is exceeded. Subclasses
+    cache other values by overriding prepare().
+    """
+
+    def __init__(self, max_entries=256, max_bytes=64 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return self._entries[key][0]
+            self.misses += 1
+
+        value, size = self.prepare(compute())
+        if size > self.max_bytes:
+            return value
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (value, size)
+                self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+        return value
+
+    def prepare(self, value):
+        """The value to store for a compute() result and its size in bytes; 0 bounds by max_entries only"""
+        return value, 0
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+            }
+
+
+def multinomial_pmf_grid(n, p):
+    """PMF of (X₁, X₂) for 3 categories over the (n+1)×(n+1) grid, zero outside the simplex"""
+    from scipy.special import gammaln, xlogy
+    p1, p2, p3 = p
+    k = np.arange(n + 1)
+    log_factorial = gammaln(np.arange(n + 1) + 1)
+
+    X, Y = np.meshgrid(k, k)
+    Z = n - X - Y
+    valid = Z >= 0
+    Z = np.where(valid, Z, 0)
+
+    log_pmf = (log_factorial[n]
+               - log_factorial[X] - log_factorial[Y] - log_factorial[Z]
+               + xlogy(k, p1)[np.newaxis, :]
+               + xlogy(k, p2)[:, np.newaxis]
+               + xlogy(Z, p3))
+    probs = np.zeros(X.shape)
+    probs[valid] = np.exp(log_pmf[valid])
+    return X, Y, probs
+
+
+def multinomial_compositions(n, k):
+    """All vectors of k non-negative integers summing to n, one per row."""
+    if k == 1:
+        return np.array([[n]])
+    # Stars and bars: choosing k-1 bar positions out of n+k-1 slots
+    bars = np.fromiter(
+        (i for c in combinations(range(n + k - 1), k - 1) for i in c),
+        dtype=np.int64,
+    ).reshape(-1, k - 1)
+    edges = np.hstack([
+        np.full((len(bars), 1), -1),
+        bars,
+        np.full((len(bars), 1), n + k - 1),
+    ])
+    return np.diff(edges, axis=1) - 1
+
+
+def multinomial_pmf_compositions(n, p):
+    """PMF over the valid compositions only, for any number of categories."""
+    from scipy.special import gammaln, xlogy
+    p = np.asarray(p, dtype=float)
+    counts = multinomial_compositions(n, len(p))
+    log_factorial = gammaln(np.arange(n + 1) + 1)
+    log_pmf = (log_factorial[n]
+               - log_factorial[counts].sum(axis=1)
+               + xlogy(counts, p).sum(axis=1))
+    return counts, np.exp(log_pmf)
+
+
+def multivariate_normal_grid(mean, cov, resolution=200, n_std=4.0, dtype=np.float32):
+    """Evaluate the 2-D normal density on a grid covering ±n_std σ around the mean.
+
+    The grid is the bounding box of the n_std-σ ellipse spanned by the
+    principal axes of cov, i.e. n_std·sqrt(Σᵢᵢ) along each coordinate.
+    Returns 1-D x and y axes and the (resolution, resolution) density.
+    """
+    from scipy.linalg import solve_triangular
+    mean = np.asarray(mean, dtype=float)
+    cov = np.asarray(cov, dtype=float)
+    try:
+        chol = np.linalg.cholesky(cov)
+    except np.linalg.LinAlgError:
+        raise RuntimeError('Covariance matrix must be positive definite (|ρ| < 1)')
+
+    half_width = n_std * np.sqrt(np.diag(cov))
+    x = np.linspace(mean[0] - half_width[0], mean[0] + half_width[0], resolution, dtype=dtype)
+    y = np.linspace(mean[1] - half_width[1], mean[1] + half_width[1], resolution, dtype=dtype)
+
+    # Mahalanobis distance via the Cholesky factor: |L⁻¹(v - μ)|²
+    diff = np.empty((2, resolution, resolution), dtype=dtype)
+    diff[0] = (x - dtype(mean[0]))[np.newaxis, :]
+    diff[1] = (y - dtype(mean[1]))[:, np.newaxis]
+    z = solve_triangular(chol.astype(dtype), diff.reshape(2, -1), lower=True, check_finite=False)
+    mahalanobis = np.einsum('ij,ij->j', z, z).reshape(resolution, resolution)
+
+    norm = 2 * np.pi * np.prod(np.diag(chol))
+    density = np.exp(-0.5 * mahalanobis) / dtype(norm)
+    return x, y, density
+
+
+def support_window(rv, tail=GRID_TAIL, iqr_span=GRID_IQR_SPAN, pad=GRID_PAD):
+    """Plot domain: the [tail, 1 - tail] quantile range of rv.
+
+    Without a finite variance (Cauchy) that range is huge, so it is capped at
+    iqr_span IQRs around the median. Ends within pad of a finite support bound
+    are moved pad beyond it, so jumps there (uniform edges, the exponential at
+    0) stay visible.
+    """
+    support_low, support_high = rv.support()
+    low, high = rv.ppf(tail), rv.isf(tail)
+    if not np.isfinite(rv.var()):
+        median = rv.median()
+        iqr = rv.ppf(0.75) - rv.ppf(0.25)
+        low, high = max(low, median - iqr_span * iqr), min(high, median + iqr_span * iqr)
+    margin = pad * (high - low)
+    if np.isfinite(support_low) and low - support_low < margin:
+        low = support_low - margin
+    if np.isfinite(support_high) and support_high - high < margin:
+        high = support_high + margin
+    return float(low), float(high)
+
+
+def plan_grid(rv, budget=GRID_POINTS, tail=GRID_TAIL):
+    """x grid and pdf values on at most budget points, concentrated where the density bends.
+
+    Starts from a uniform grid over support_window() and repeatedly bisects
+    the intervals with the largest second difference of the pdf, down to a
+    quarter of the uniform spacing. Every pdf evaluation is used for the
+    returned curve.
+    """
+    low, high = support_window(rv, tail)
+    min_width = (high - low) / (4 * budget)
+    x = np.linspace(low, high, max(budget // 4, 3))
+    # Keep clear of support bounds where the density is infinite (χ² with df = 1,
+    # gamma with α < 1): points near a pole would set the y scale for the whole plot
+    poles = np.array([bound for bound in rv.support() if np.isfinite(bound) and not np.isfinite(rv.pdf(bound))])
+    for pole in poles:
+        x = x[np.abs(x - pole) >= (x[1] - x[0]) / 2]
+    y = rv.pdf(x)
+    while len(x) < budget:
+        # Infinite peaks (gamma with α < 1 at 0) count as the tallest finite value
+        finite = np.isfinite(y)
+        peak = y[finite].max() if finite.any() else 1.0
+        yy = np.where(finite, y, peak)
+        curvature = np.zeros(len(x))
+        curvature[1:-1] = np.abs(yy[:-2] - 2 * yy[1:-1] + yy[2:])
+        # Width breaks ties, so flat stretches are refined evenly rather than not at all
+        width = np.diff(x)
+        score = np.maximum(curvature[:-1], curvature[1:]) + 1e-12 * peak * width
+        # Stop bisecting at min_width, or a jump or pole would absorb the whole budget
+        score[width < min_width] = -1
+        for pole in poles:
+            score[(x[:-1] <= pole) & (x[1:] >= pole)] = -1
+        count = min(budget - len(x), max(1, (len(x) - 1) // 2), int(np.count_nonzero(score >= 0)))
+        if count == 0:
+            break
+        split = np.sort(np.argpartition(-score, count - 1)[:count])
+        midpoints = (x[split] + x[split + 1]) / 2
+        x = np.insert(x, split + 1, midpoints)
+        y = np.insert(y, split + 1, rv.pdf(midpoints))
+    return x, y
+
+
+def pmf_window(rv, tail=PMF_TAIL):
+    """Smallest integer range [low, high] of rv's support outside which at most 2·tail of the mass lies"""
+    support_low, support_high = rv.support()
+    with np.errstate(divide='ignore'):  # scipy's geometric quantiles at p = 1
+        low = int(max(support_low, rv.ppf(tail)))
+        return low, max(low, int(min(support_high, rv.isf(tail))))
+
+
+class Recurrence:
+    """A discrete family's pmf as its mode and log P(k+1)/P(k).
+
+    Filling a window then takes one vectorized ratio evaluation and two
+    cumulative sums, and no factorials of large arguments.
+    """
+
+    def __init__(self, mode, log_ratio):
+        self.mode = mode
+        self.log_ratio = log_ratio
+
+    def pmf(self, low, high, **params):
+        """(k, pmf) for k = low..high, normalized over the window.
+
+        Ratios are accumulated outwards from the mode, so the largest values
+        are the most precise; pmf_window() leaves out at most 2·PMF_TAIL of the
+        mass, which bounds the error of normalizing there.
+        """
+        k = np.arange(low, high + 1)
+        mode = min(max(int(self.mode(**params)), low), high) - low
+        with np.errstate(divide='ignore'):
+            log_ratios = self.log_ratio(k[:-1], **params)
+        # steps[i] = log P(k[i]) / P(mode): sums of ratios above the mode, minus sums below it
+        steps = np.zeros(len(k))
+        np.cumsum(log_ratios[mode:], out=steps[mode + 1:])
+        steps[:mode] = -np.cumsum(log_ratios[:mode][::-1])[::-1]
+        pmf = np.exp(steps)
+        return k, pmf / pmf.sum()
+
+
+def aggregate_bars(x, y, max_bars=MAX_BARS):
+    """Sum runs of consecutive pmf values into at most max_bars bars.
+
+    Returns bar centres and masses. Every bar but the last sums the same
+    number of values of k, the spacing of the centres; the last sums what is
+    left and is centred on that range (see bar_widths()).
+    """
+    width = -(-len(x) // max_bars)
+    if width <= 1:
+        return x, y
+    starts = np.arange(0, len(x), width)
+    ends = np.minimum(starts + width, len(x)) - 1
+    return (x[starts] + x[ends]) / 2, np.add.reduceat(y, starts)
+
+
+def bar_widths(x):
+    """Width of each aggregate_bars() bar: the spacing of the centres, less for a shorter last bar"""
+    widths = np.full(len(x), float(x[1] - x[0]) if len(x) > 1 else 1.0)
+    if len(x) > 2:
+        widths[-1] = 2 * (x[-1] - x[-2]) - widths[0]
+    return widths
+
+
+def plan_bars(rv, recurrence, max_bars=MAX_BARS, tail=PMF_TAIL, **params):
+    """Display bars for a discrete pmf: evaluated on pmf_window() only, aggregated when that is wide"""
+    return aggregate_bars(*recurrence.pmf(*pmf_window(rv, tail), **params), max_bars)
+
+
+BINOMIAL = Recurrence(
+    lambda n, p: (n + 1) * p,
+    lambda k, n, p: np.log((n - k) / (k + 1)) + np.log(p) - np.log1p(-p),
+)
+POISSON = Recurrence(
+    lambda lambda_: lambda_,
+    lambda k, lambda_: np.log(lambda_) - np.log(k + 1),
+)
+GEOMETRIC = Recurrence(
+    lambda p: 1,
+    # p = 1 puts all the mass on k = 1
+    lambda k, p: np.full(len(k), np.log1p(-p) if p < 1 else -np.inf),
+)
+HYPERGEOMETRIC = Recurrence(
+    lambda N, K, n: (n + 1) * (K + 1) / (N + 2),
+    lambda k, N, K, n: np.log(K - k) + np.log(n - k) - np.log(k + 1) - np.log(N - K - n + k + 1),
+)
+
+
+class Model(ABC):
+    """A distribution family: explicit params in, arrays out"""
+    kind = None
+
+    def __init__(self, name, params):
+        self.name = name
+        self.params = params
+
+    def check(self, params):
+        missing = set(self.params) - set(params)
+        if missing:
+            raise ValueError(f"{self.name}: missing parameters {sorted(missing)}")
+
+    @abstractmethod
+    def density(self, **params):
+        """(x, pdf/pmf) arrays on the default plotting grid"""
+        pass
+
+    @abstractmethod
+    def evaluate(self, x=None, quantiles=None, **params):
+        """Dict of named arrays: density on x (default grid), cdf, and ppf at the given quantiles"""
+        pass
+
+
+class UnivariateModel(Model):
+    """scipy-backed family.
+
+    With grid=None, continuous plot points are placed by plan_grid and a
+    discrete pmf is evaluated through its recurrence on pmf_window(), then
+    aggregated into bars by plan_bars.
+    """
+
+    def __init__(self, name, kind, params, rv, grid=None, recurrence=None):
+        super().__init__(name, params)
+        self.kind = kind
+        self._rv = rv
+        self._grid = grid
+        self._recurrence = recurrence
+        self._plans = LRUCache(max_entries=GRID_CACHE_SIZE)
+
+    @property
+    def density_name(self):
+        return 'pdf' if self.kind == 'continuous' else 'pmf'
+
+    def rv(self, **params):
+        """Frozen scipy.stats distribution for params"""
+        self.check(params)
+        return self._rv(**params)
+
+    def plan(self, **params):
+        """(x, pdf) from plan_grid, or (bar centres, pmf) from plan_bars, cached per parameter set"""
+        return self._plans.get_or_compute(freeze(params), lambda: self._plan(**params))
+
+    def _plan(self, **params):
+        if self.kind == 'discrete':
+            x, y = plan_bars(self.rv(**params), self._recurrence, **params)
+        else:
+            x, y = plan_grid(self.rv(**params))
+        x.setflags(write=False)
+        y.setflags(write=False)
+        return x, y
+
+    def grid(self, **params):
+        self.check(params)
+        if self._grid is not None:
+            return self._grid(**params)
+        if self.kind == 'discrete':
+            low, high = pmf_window(self.rv(**params))
+            return np.arange(low, high + 1)
+        return self.plan(**params)[0]
+
+    def density(self, **params):
+        if self._grid is None:
+            self.check(params)
+            return self.plan(**params)
+        x = self.grid(**params)
+        return x, getattr(self.rv(**params), self.density_name)(x)
+
+    def evaluate(self, x=None, quantiles=None, **params):
+        """Unaggregated: a discrete default grid is every k in pmf_window()"""
+        rv = self.rv(**params)
+        if x is None and self._recurrence is not None:
+            x, density = self._recurrence.pmf(*pmf_window(rv), **params)
+        else:
+            x = self.grid(**params) if x is None else np.asarray(x)
+            density = getattr(rv, self.density_name)(x)
+        with np.errstate(divide='ignore'):  # scipy's geometric cdf and quantiles at p = 1
+            result = {
+                'x': x,
+                self.density_name: density,
+                'cdf': rv.cdf(x),
+            }
+            if quantiles is not None:
+                result['quantiles'] = np.asarray(quantiles, dtype=float)
+                result['ppf'] = rv.ppf(result['quantiles'])
+        return result
+
+
+class MultivariateNormalModel(Model):
+    kind = 'multivariate'
+
+    def __init__(self):
+        super().__init__('multivariate_normal', ['mean', 'cov'])
+
+    def density(self, mean, cov, resolution=200, n_std=4.0):
+        return multivariate_normal_grid(mean, cov, resolution=resolution, n_std=n_std)
+
+    def evaluate(self, x=None, quantiles=None, **params):
+        self.check(params)
+        if x is None:
+            x1, x2, pdf = self.density(**params)
+            return {'x1': x1, 'x2': x2, 'pdf': pdf}
+        x = np.asarray(x, dtype=float)
+        rv = scipy.stats.multivariate_normal(params['mean'], params['cov'])
+        return {'x': x, 'pdf': rv.pdf(x), 'cdf': rv.cdf(x)}
+
+
+class MultinomialModel(Model):
+    kind = 'multivariate'
+
+    def __init__(self):
+        super().__init__('multinomial', ['n', 'p'])
+
+    def density(self, n, p):
+        return multinomial_pmf_grid(n, p)
+
+    def evaluate(self, x=None, quantiles=None, **params):
+        self.check(params)
+        if x is None:
+            counts, pmf = multinomial_pmf_compositions(params['n'], params['p'])
+            return {'counts': counts, 'pmf': pmf}
+        x = np.asarray(x)
+        return {'counts': x, 'pmf': scipy.stats.multinomial.pmf(x, params['n'], params['p'])}
+
+
+MODELS = {model.name: model for model in [
+    UnivariateModel(
+        'normal', 'continuous', ['mean', 'std'],
+        lambda mean, std: scipy.stats.norm(mean, std),
+    ),
+    UnivariateModel(
+        'chi_squared', 'continuous', ['df'],
+        lambda df: scipy.stats.chi2(df),
+    ),
+    UnivariateModel(
+        'exponential', 'continuous', ['rate'],
+        lambda rate: scipy.stats.expon(scale=1/rate),
+    ),
+    UnivariateModel(
+        'uniform', 'continuous', ['a', 'b'],
+        lambda a, b: scipy.stats.uniform(a, b - a),
+    ),
+    UnivariateModel(
+        'cauchy', 'continuous', ['loc', 'scale'],
+        lambda loc, scale: scipy.stats.cauchy(loc, scale),
+    ),
+    UnivariateModel(
+        'gamma', 'continuous', ['alpha', 'beta'],
+        lambda alpha, beta: scipy.stats.gamma(alpha, scale=beta),
+    ),
+    UnivariateModel(
+        'binomial', 'discrete', ['n', 'p'],
+        lambda n, p: scipy.stats.binom(n, p),
+        recurrence=BINOMIAL,
+    ),
+    UnivariateModel(
+        'poisson', 'discrete', ['lambda_'],
+        lambda lambda_: scipy.stats.poisson(lambda_),
+        recurrence=POISSON,
+    ),
+    UnivariateModel(
+        'geometric', 'discrete', ['p'],
+        lambda p: scipy.stats.geom(p),
+        recurrence=GEOMETRIC,
+    ),
+    UnivariateModel(
+        'bernoulli', 'discrete', ['p'],
+        lambda p: scipy.stats.bernoulli(p),
+        lambda p: np.array([0, 1]),
+    ),
+    UnivariateModel(
+        'hypergeometric', 'discrete', ['N', 'K', 'n'],
+        lambda N, K, n: scipy.stats.hypergeom(N, K, n),
+        recurrence=HYPERGEOMETRIC,
+    ),
+    UnivariateModel(
+        'uniform_discrete', 'discrete', ['low', 'high'],
+        lambda low, high: scipy.stats.randint(low, high + 1),
+        lambda low, high: np.arange(low, high + 1),
+    ),
+    MultivariateNormalModel(),
+    MultinomialModel(),
+]}
+
+
+def clear_caches():
+    """Forget every cached plot grid, e.g. to time evaluation from scratch"""
+    for model in MODELS.values():
+        if isinstance(model, UnivariateModel):
+            model._plans.clear()
+
+
+def get_model(name):
+    if name not in MODELS:
+        raise ValueError(f"Unknown distribution: {name}")
+    return MODELS[name]
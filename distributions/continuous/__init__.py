@@ -1,8 +1,11 @@
-from .normal import NormalDistribution
-from .mutivariative_normal import MultivariateNormalDistribution
-from .chi_squared import ChiSquaredDistribution
-from .uniform import UniformDistribution
-from .exponential import ExponentialDistribution
-from .cauchy import CauchyDistribution
-from .gamma import GammaDistribution
-__all__ = ['NormalDistribution', 'MultivariateNormalDistribution', 'ChiSquaredDistribution', 'UniformDistribution', 'ExponentialDistribution', 'CauchyDistribution', 'GammaDistribution']
+from lazy_imports import lazy_exports
+
+__getattr__, __all__ = lazy_exports(__name__, {
+    'NormalDistribution': '.normal',
+    'MultivariateNormalDistribution': '.mutivariative_normal',
+    'ChiSquaredDistribution': '.chi_squared',
+    'UniformDistribution': '.uniform',
+    'ExponentialDistribution': '.exponential',
+    'CauchyDistribution': '.cauchy',
+    'GammaDistribution': '.gamma',
+})
@@ -1,17 +1,20 @@
-import numpy as np
-from scipy.stats import cauchy
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class CauchyDistribution(Distribution):
+    model = 'cauchy'
+    parameters = (
+        Parameter('loc', 'Location (x₀)', -10.0, 10.0, 0.0, 0.1),
+        Parameter('scale', 'Scale (γ)', 0.1, 10.0, 1.0, 0.1),
+    )
+
     def get_parameters(self):
-        self.loc = st.slider('Location (x₀)', -10.0, 10.0, 0.0, 0.1)
-        self.scale = st.slider('Scale (γ)', 0.1, 10.0, 1.0, 0.1)
+        self.loc = self.slider('loc')
+        self.scale = self.slider('scale')
         return {'loc': self.loc, 'scale': self.scale}
 
     def plot(self, ax):
-        x = np.linspace(self.loc - 10*self.scale, self.loc + 10*self.scale, 1000)
-        y = cauchy.pdf(x, loc=self.loc, scale=self.scale)
+        x, y = self.evaluate_model({'loc': self.loc, 'scale': self.scale})
         ax.plot(x, y)
         ax.set_xlabel('x')
         ax.set_ylabel('Probability Density')
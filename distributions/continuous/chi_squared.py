@@ -1,16 +1,18 @@
-import numpy as np
-from scipy.stats import chi2
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class ChiSquaredDistribution(Distribution):
+    model = 'chi_squared'
+    parameters = (
+        Parameter('df', 'Degrees of freedom', 1, 30, 1),
+    )
+
     def get_parameters(self):
-        self.df = st.slider('Degrees of freedom', 1, 30, 1)
+        self.df = self.slider('df')
         return {'df': self.df}
 
     def plot(self, ax):
-        x = np.linspace(0, max(30, self.df*3), 200)
-        y = chi2.pdf(x, self.df)
+        x, y = self.evaluate_model({'df': self.df})
         ax.plot(x, y)
         ax.set_xlabel('x')
         ax.set_ylabel('Probability Density')
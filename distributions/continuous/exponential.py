@@ -1,16 +1,18 @@
-import numpy as np
-from scipy.stats import expon
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class ExponentialDistribution(Distribution):
+    model = 'exponential'
+    parameters = (
+        Parameter('rate', 'Rate parameter (λ)', 0.1, 5.0, 1.0, 0.1),
+    )
+
     def get_parameters(self):
-        self.rate = st.slider('Rate parameter (λ)', 0.1, 5.0, 1.0, 0.1)
+        self.rate = self.slider('rate')
         return {'rate': self.rate}
 
     def plot(self, ax):
-        x = np.linspace(0, 5/self.rate, 200)
-        y = self.rate * np.exp(-self.rate * x)
+        x, y = self.evaluate_model({'rate': self.rate})
         ax.plot(x, y)
         ax.set_xlabel('x')
         ax.set_ylabel('Probability Density')
@@ -1,15 +1,18 @@
 
-import numpy as np
-from scipy.stats import gamma
 import streamlit as st
-from ..base import Distribution
-import matplotlib.pyplot as plt
+from ..base import Distribution, Parameter
 
 class GammaDistribution(Distribution):
+    model = 'gamma'
+    parameters = (
+        Parameter('alpha', 'α (shape)', 0.1, 10.0, 2.0, 0.1),
+        Parameter('beta', 'β (scale)', 0.1, 10.0, 1.0, 0.1),
+    )
+
     def get_parameters(self):
         st.write('Shape and Scale Parameters:')
-        self.alpha = st.slider('α (shape)', 0.1, 10.0, 2.0, 0.1)
-        self.beta = st.slider('β (scale)', 0.1, 10.0, 1.0, 0.1)
+        self.alpha = self.slider('alpha')
+        self.beta = self.slider('beta')
         
         return {
             'alpha': self.alpha,
@@ -17,9 +20,7 @@ class GammaDistribution(Distribution):
         }
 
     def plot(self, ax):
-        x = np.linspace(0, 20, 1000)
-        rv = gamma(self.alpha, scale=self.beta)
-        y = rv.pdf(x)
+        x, y = self.evaluate_model({'alpha': self.alpha, 'beta': self.beta})
         ax.plot(x, y)
         ax.set_xlabel('x')
         ax.set_ylabel('Probability Density')
@@ -1,19 +1,28 @@
 import numpy as np
-from scipy.stats import multivariate_normal
 import streamlit as st
-from ..base import Distribution
-import matplotlib.pyplot as plt
+from ..base import Distribution, Parameter
 
 class MultivariateNormalDistribution(Distribution):
+    model = 'multivariate_normal'
+    parameters = (
+        Parameter('mean1', 'μ₁', -5.0, 5.0, 0.0, 0.1),
+        Parameter('mean2', 'μ₂', -5.0, 5.0, 0.0, 0.1),
+        Parameter('var1', 'σ₁²', 0.1, 5.0, 1.0, 0.1),
+        Parameter('var2', 'σ₂²', 0.1, 5.0, 1.0, 0.1),
+        Parameter('corr', 'Correlation ρ', -1.0, 1.0, 0.0),
+    )
+    grid_resolution = 200
+    grid_n_std = 4.0
+
     def get_parameters(self):
         st.write('Mean Vector:')
-        self.mean1 = st.slider('μ₁', -5.0, 5.0, 0.0, 0.1)
-        self.mean2 = st.slider('μ₂', -5.0, 5.0, 0.0, 0.1)
+        self.mean1 = self.slider('mean1')
+        self.mean2 = self.slider('mean2')
         
         st.write('Covariance Matrix:')
-        self.var1 = st.slider('σ₁²', 0.1, 5.0, 1.0, 0.1)
-        self.var2 = st.slider('σ₂²', 0.1, 5.0, 1.0, 0.1)
-        self.corr = st.slider('Correlation ρ', -1.0, 1.0, 0.0)
+        self.var1 = self.slider('var1')
+        self.var2 = self.slider('var2')
+        self.corr = self.slider('corr')
         
         self.cov12 = self.corr * np.sqrt(self.var1 * self.var2)
         self.cov_matrix = np.array([[self.var1, self.cov12], [self.cov12, self.var2]])
@@ -24,13 +33,12 @@ class MultivariateNormalDistribution(Distribution):
         }
 
     def plot(self, ax):
-        x, y = np.mgrid[-5:5:.01, -5:5:.01]
-        pos = np.dstack((x, y))
-        mean = [self.mean1, self.mean2]
-        rv = multivariate_normal(mean, self.cov_matrix)
-        z = rv.pdf(pos)
+        x, y, z = self.evaluate_model(
+            {'mean': [self.mean1, self.mean2], 'cov': self.cov_matrix},
+            resolution=self.grid_resolution, n_std=self.grid_n_std,
+        )
         contour = ax.contourf(x, y, z, levels=20, cmap='viridis')
-        plt.colorbar(contour, label='Probability Density')
+        ax.figure.colorbar(contour, ax=ax, label='Probability Density')
         ax.set_xlabel('X₁')
         ax.set_ylabel('X₂')
 
@@ -1,17 +1,20 @@
-import numpy as np
-from scipy.stats import multivariate_normal, chi2
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class NormalDistribution(Distribution):
+    model = 'normal'
+    parameters = (
+        Parameter('mean', 'Mean', -10.0, 10.0, 0.0, 0.1),
+        Parameter('std', 'Standard deviation', 0.1, 5.0, 1.0, 0.1),
+    )
+
     def get_parameters(self):
-        self.mean = st.slider('Mean', -10.0, 10.0, 0.0, 0.1)
-        self.std = st.slider('Standard deviation', 0.1, 5.0, 1.0, 0.1)
+        self.mean = self.slider('mean')
+        self.std = self.slider('std')
         return {'mean': self.mean, 'std': self.std}
 
     def plot(self, ax):
-        x = np.linspace(self.mean - 4*self.std, self.mean + 4*self.std, 100)
-        y = np.exp(-((x - self.mean)**2)/(2*self.std**2))/(self.std*np.sqrt(2*np.pi))
+        x, y = self.evaluate_model({'mean': self.mean, 'std': self.std})
         ax.plot(x, y)
         ax.set_xlabel('x')
         ax.set_ylabel('Probability Density')
@@ -1,19 +1,23 @@
-import numpy as np
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class UniformDistribution(Distribution):
+    model = 'uniform'
+    parameters = (
+        Parameter('a', 'Lower bound (a)', -10.0, 10.0, 0.0, 0.1),
+        Parameter('b', 'Upper bound (b)', -10.0, 10.0, 1.0, 0.1),
+    )
+
     def get_parameters(self):
-        self.a = st.slider('Lower bound (a)', -10.0, 10.0, 0.0, 0.1)
-        self.b = st.slider('Upper bound (b)', -10.0, 10.0, 1.0, 0.1)
+        self.a = self.slider('a')
+        self.b = self.slider('b')
         if self.b <= self.a:
             st.error('Upper bound must be greater than lower bound')
             self.b = self.a + 0.1
         return {'a': self.a, 'b': self.b}
 
     def plot(self, ax):
-        x = np.linspace(self.a - 0.5, self.b + 0.5, 100)
-        y = np.where((x >= self.a) & (x <= self.b), 1/(self.b-self.a), 0)
+        x, y = self.evaluate_model({'a': self.a, 'b': self.b})
         ax.plot(x, y)
         ax.set_xlabel('x')
         ax.set_ylabel('Probability Density')
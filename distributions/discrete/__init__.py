@@ -1,8 +1,11 @@
-from .binomial import BinomialDistribution
-from .poisson import PoissonDistribution
-from .multinomial import MultinomialDistribution
-from .geometric import GeometricDistribution
-from .bernoulli import BernoulliDistribution
-from .hypergeometric import HypergeometricDistribution
-from .uniform import UniformDiscreteDistribution
-__all__ = ['BinomialDistribution', 'PoissonDistribution', 'MultinomialDistribution', 'GeometricDistribution', 'BernoulliDistribution', 'HypergeometricDistribution', 'UniformDiscreteDistribution']
+from lazy_imports import lazy_exports
+
+__getattr__, __all__ = lazy_exports(__name__, {
+    'BinomialDistribution': '.binomial',
+    'PoissonDistribution': '.poisson',
+    'MultinomialDistribution': '.multinomial',
+    'GeometricDistribution': '.geometric',
+    'BernoulliDistribution': '.bernoulli',
+    'HypergeometricDistribution': '.hypergeometric',
+    'UniformDiscreteDistribution': '.uniform',
+})
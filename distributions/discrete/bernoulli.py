@@ -1,16 +1,18 @@
-import numpy as np
-from scipy.stats import bernoulli
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class BernoulliDistribution(Distribution):
+    model = 'bernoulli'
+    parameters = (
+        Parameter('p', 'Probability of success (p)', 0.0, 1.0, 0.5, 0.01),
+    )
+
     def get_parameters(self):
-        self.p = st.slider('Probability of success (p)', 0.0, 1.0, 0.5, 0.01)
+        self.p = self.slider('p')
         return {'p': self.p}
 
     def plot(self, ax):
-        x = np.array([0, 1])
-        y = bernoulli.pmf(x, self.p)
+        x, y = self.evaluate_model({'p': self.p})
         ax.bar(x, y, alpha=0.8)
         ax.set_xlabel('Outcome')
         ax.set_ylabel('Probability')
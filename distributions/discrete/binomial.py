@@ -1,18 +1,21 @@
-import numpy as np
-from scipy.stats import binom
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class BinomialDistribution(Distribution):
+    model = 'binomial'
+    parameters = (
+        Parameter('n', 'Number of trials (n)', 1, 10**7, 10),
+        Parameter('p', 'Probability of success (p)', 0.0, 1.0, 0.5, 0.01),
+    )
+
     def get_parameters(self):
-        self.n = st.slider('Number of trials (n)', 1, 100, 10)
-        self.p = st.slider('Probability of success (p)', 0.0, 1.0, 0.5, 0.01)
+        self.n = self.slider('n')
+        self.p = self.slider('p')
         return {'n': self.n, 'p': self.p}
 
     def plot(self, ax):
-        x = np.arange(0, self.n + 1)
-        y = binom.pmf(x, self.n, self.p)
-        ax.bar(x, y, alpha=0.8)
+        x, y = self.evaluate_model({'n': self.n, 'p': self.p})
+        ax.bar(x, y, width=self.bar_width(x), alpha=0.8)
         ax.set_xlabel('Number of Successes')
         ax.set_ylabel('Probability')
 
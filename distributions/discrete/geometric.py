@@ -1,17 +1,19 @@
-import numpy as np
-from scipy.stats import geom
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class GeometricDistribution(Distribution):
+    model = 'geometric'
+    parameters = (
+        Parameter('p', 'Probability of success (p)', 0.01, 1.0, 0.5, 0.01),
+    )
+
     def get_parameters(self):
-        self.p = st.slider('Probability of success (p)', 0.01, 1.0, 0.5, 0.01)
+        self.p = self.slider('p')
         return {'p': self.p}
 
     def plot(self, ax):
-        x = np.arange(1, min(20, int(5/self.p)))
-        y = geom.pmf(x, self.p)
-        ax.bar(x, y, alpha=0.8)
+        x, y = self.evaluate_model({'p': self.p})
+        ax.bar(x, y, width=self.bar_width(x), alpha=0.8)
         ax.set_xlabel('Number of Trials Until Success')
         ax.set_ylabel('Probability')
 
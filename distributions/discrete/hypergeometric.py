@@ -1,15 +1,19 @@
-import numpy as np
-from scipy.stats import hypergeom
 import streamlit as st
-from ..base import Distribution
-import matplotlib.pyplot as plt
+from ..base import Distribution, Parameter
 
 class HypergeometricDistribution(Distribution):
+    model = 'hypergeometric'
+    parameters = (
+        Parameter('N', 'N (population size)', 1, 10**7, 50),
+        Parameter('K', 'K (number of success states)', 0, 10**7, 20),
+        Parameter('n', 'n (number of draws)', 0, 10**7, 10),
+    )
+
     def get_parameters(self):
         st.write('Population Parameters:')
-        self.N = st.slider('N (population size)', 1, 100, 50)
-        self.K = st.slider('K (number of success states)', 0, self.N, 20)
-        self.n = st.slider('n (number of draws)', 0, self.N, 10)
+        self.N = self.slider('N')
+        self.K = self.slider('K', max_value=self.N)
+        self.n = self.slider('n', max_value=self.N)
         
         return {
             'N': self.N,
@@ -18,10 +22,8 @@ class HypergeometricDistribution(Distribution):
         }
 
     def plot(self, ax):
-        x = np.arange(0, min(self.n, self.K) + 1)
-        rv = hypergeom(self.N, self.K, self.n)
-        pmf = rv.pmf(x)
-        ax.bar(x, pmf)
+        x, pmf = self.evaluate_model({'N': self.N, 'K': self.K, 'n': self.n})
+        ax.bar(x, pmf, width=self.bar_width(x))
         ax.set_xlabel('Number of Successes')
         ax.set_ylabel('Probability')
         ax.set_title('Hypergeometric Distribution')
@@ -1,17 +1,19 @@
-import numpy as np
-from scipy.stats import poisson
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class PoissonDistribution(Distribution):
+    model = 'poisson'
+    parameters = (
+        Parameter('lambda_', 'Rate parameter (λ)', 0.1, 1000.0, 5.0, 0.1),
+    )
+
     def get_parameters(self):
-        self.lambda_ = st.slider('Rate parameter (λ)', 0.1, 20.0, 5.0, 0.1)
+        self.lambda_ = self.slider('lambda_')
         return {'lambda_': self.lambda_}
 
     def plot(self, ax):
-        x = np.arange(0, max(20, int(self.lambda_*3)))
-        y = poisson.pmf(x, self.lambda_)
-        ax.bar(x, y, alpha=0.8)
+        x, y = self.evaluate_model({'lambda_': self.lambda_})
+        ax.bar(x, y, width=self.bar_width(x), alpha=0.8)
         ax.set_xlabel('Number of Events')
         ax.set_ylabel('Probability')
 
@@ -1,13 +1,17 @@
-import numpy as np
-from scipy.stats import randint
 import streamlit as st
-from ..base import Distribution
+from ..base import Distribution, Parameter
 
 class UniformDiscreteDistribution(Distribution):
+    model = 'uniform_discrete'
+    parameters = (
+        Parameter('low', 'Low (a)', -10, 10, 0),
+        Parameter('high', 'High (b)', -9, 20, 10),
+    )
+
     def get_parameters(self):
         st.write('Distribution Parameters:')
-        self.low = st.slider('Low (a)', -10, 10, 0)
-        self.high = st.slider('High (b)', self.low + 1, 20, 10)
+        self.low = self.slider('low')
+        self.high = self.slider('high', min_value=self.low + 1)
         
         return {
             'low': self.low,
@@ -15,9 +19,7 @@ class UniformDiscreteDistribution(Distribution):
         }
 
     def plot(self, ax):
-        x = np.arange(self.low, self.high + 1)
-        rv = randint(self.low, self.high + 1)
-        pmf = rv.pmf(x)
+        x, pmf = self.evaluate_model({'low': self.low, 'high': self.high})
         ax.bar(x, pmf)
         ax.set_xlabel('Value')
         ax.set_ylabel('Probability')
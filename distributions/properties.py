@@ -0,0 +1,291 @@
+"""Moments, entropy, quantiles and support for the current parameters.
+
+Closed forms are used where they are known; anything missing is computed
+numerically from the model's scipy distribution: by summing the pmf over its
+support window for discrete families, and by Gauss-Legendre quadrature in
+probability space (E[g(X)] = ∫₀¹ g(F⁻¹(u)) du) for continuous ones.
+
+Every function broadcasts over array-valued parameters, so tabulate() fills a
+whole parameter grid in one call. properties() is the scalar entry point used
+by the UI and memoizes its results per parameter tuple.
+
+Kurtosis is excess kurtosis (0 for the normal distribution).
+"""
+import numpy as np
+from .compute import LRUCache, freeze, get_model
+
+MOMENTS = ('mean', 'variance', 'skewness', 'kurtosis', 'entropy')
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+
+# Discrete support windows are cut where less than TAIL mass lies beyond
+TAIL = 1e-12
+QUADRATURE_NODES = 256
+MEMO_SIZE = 1024
+# Largest pmf/quadrature array evaluated at once by the numeric fallback
+CHUNK_ELEMENTS = 2**20
+
+
+def _xlogx(p):
+    from scipy.special import xlogy
+    return xlogy(p, p)
+
+
+def _normal(mean, std):
+    return {
+        'mean': mean, 'variance': std**2, 'skewness': 0 * mean, 'kurtosis': 0 * mean,
+        'entropy': 0.5 * np.log(2 * np.pi * np.e * std**2),
+    }
+
+
+def _chi_squared(df):
+    from scipy.special import digamma, gammaln
+    half = df / 2
+    return {
+        'mean': df, 'variance': 2 * df, 'skewness': np.sqrt(8 / df), 'kurtosis': 12 / df,
+        'entropy': half + np.log(2) + gammaln(half) + (1 - half) * digamma(half),
+    }
+
+
+def _exponential(rate):
+    return {
+        'mean': 1 / rate, 'variance': 1 / rate**2, 'skewness': 2 + 0 * rate, 'kurtosis': 6 + 0 * rate,
+        'entropy': 1 - np.log(rate),
+    }
+
+
+def _uniform(a, b):
+    return {
+        'mean': (a + b) / 2, 'variance': (b - a)**2 / 12, 'skewness': 0 * a, 'kurtosis': -1.2 + 0 * a,
+        'entropy': np.log(b - a),
+    }
+
+
+def _cauchy(loc, scale):
+    undefined = np.full(np.broadcast(loc, scale).shape, np.nan)
+    return {
+        'mean': undefined, 'variance': undefined, 'skewness': undefined, 'kurtosis': undefined,
+        'entropy': np.log(4 * np.pi * scale) + 0 * loc,
+    }
+
+
+def _gamma(alpha, beta):
+    from scipy.special import digamma, gammaln
+    return {
+        'mean': alpha * beta, 'variance': alpha * beta**2,
+        'skewness': 2 / np.sqrt(alpha) + 0 * beta, 'kurtosis': 6 / alpha + 0 * beta,
+        'entropy': alpha + np.log(beta) + gammaln(alpha) + (1 - alpha) * digamma(alpha),
+    }
+
+
+def _binomial(n, p):
+    variance = n * p * (1 - p)
+    return {
+        'mean': n * p, 'variance': variance,
+        'skewness': (1 - 2 * p) / np.sqrt(variance), 'kurtosis': (1 - 6 * p * (1 - p)) / variance,
+    }
+
+
+def _poisson(lambda_):
+    return {'mean': lambda_, 'variance': lambda_, 'skewness': lambda_**-0.5, 'kurtosis': 1 / lambda_}
+
+
+def _geometric(p):
+    return {
+        'mean': 1 / p, 'variance': (1 - p) / p**2,
+        'skewness': (2 - p) / np.sqrt(1 - p), 'kurtosis': 6 + p**2 / (1 - p),
+        'entropy': -(_xlogx(1 - p) + _xlogx(p)) / p,
+    }
+
+
+def _bernoulli(p):
+    variance = p * (1 - p)
+    return {
+        'mean': p, 'variance': variance,
+        'skewness': (1 - 2 * p) / np.sqrt(variance), 'kurtosis': (1 - 6 * variance) / variance,
+        'entropy': -(_xlogx(p) + _xlogx(1 - p)),
+    }
+
+
+def _hypergeometric(N, K, n):
+    return {'mean': n * K / N, 'variance': n * K / N * (N - K) / N * (N - n) / np.maximum(N - 1, 1)}
+
+
+def _uniform_discrete(low, high):
+    m2 = (high - low + 1.0)**2
+    return {
+        'mean': (low + high) / 2, 'variance': (m2 - 1) / 12, 'skewness': 0 * m2,
+        'kurtosis': np.where(m2 > 1, -6 * (m2 + 1) / (5 * np.where(m2 > 1, m2 - 1, 1)), np.nan),
+        'entropy': 0.5 * np.log(m2),
+    }
+
+
+CLOSED_FORMS = {
+    'normal': _normal,
+    'chi_squared': _chi_squared,
+    'exponential': _exponential,
+    'uniform': _uniform,
+    'cauchy': _cauchy,
+    'gamma': _gamma,
+    'binomial': _binomial,
+    'poisson': _poisson,
+    'geometric': _geometric,
+    'bernoulli': _bernoulli,
+    'hypergeometric': _hypergeometric,
+    'uniform_discrete': _uniform_discrete,
+}
+
+
+def _standardized(mean, moment):
+    """Skewness, excess kurtosis and variance from E[(X-μ)^k] for k = 2, 3, 4"""
+    variance = moment(2)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return {
+            'mean': mean,
+            'variance': variance,
+            'skewness': moment(3) / variance**1.5,
+            'kurtosis': moment(4) / variance**2 - 3,
+        }
+
+
+def _discrete_moments(rv, low, high, wanted):
+    """Moments and entropy by summing the pmf over k = low..high for a 1-D batch of parameter sets"""
+    k = np.arange(low, high + 1)[:, np.newaxis]
+    pmf = rv.pmf(k)
+    result = {}
+    if wanted - {'entropy'}:
+        mean = (k * pmf).sum(axis=0)
+        result = _standardized(mean, lambda order: ((k - mean)**order * pmf).sum(axis=0))
+    if 'entropy' in wanted:
+        result['entropy'] = -_xlogx(pmf).sum(axis=0)
+    return result
+
+
+def _continuous_moments(rv, wanted):
+    """Moments and entropy by quadrature over quantiles, E[g(X)] = ∫₀¹ g(F⁻¹(u)) du"""
+    nodes, weights = np.polynomial.legendre.leggauss(QUADRATURE_NODES)
+    u = ((nodes + 1) / 2)[:, np.newaxis]
+    weights = (weights / 2)[:, np.newaxis]
+    x = rv.ppf(u)
+    result = {}
+    if wanted - {'entropy'}:
+        mean = (weights * x).sum(axis=0)
+        result = _standardized(mean, lambda order: (weights * (x - mean)**order).sum(axis=0))
+    if 'entropy' in wanted:
+        result['entropy'] = -(weights * rv.logpdf(x)).sum(axis=0)
+    return result
+
+
+def _window_chunks(low, high):
+    """Split parameter sets into runs whose shared support window stays under CHUNK_ELEMENTS values"""
+    start = 0
+    chunk_low, chunk_high = low[0], high[0]
+    for i in range(1, len(low)):
+        window_low, window_high = min(chunk_low, low[i]), max(chunk_high, high[i])
+        if (window_high - window_low + 1) * (i + 1 - start) > CHUNK_ELEMENTS:
+            yield slice(start, i), chunk_low, chunk_high
+            start, window_low, window_high = i, low[i], high[i]
+        chunk_low, chunk_high = window_low, window_high
+    yield slice(start, len(low)), chunk_low, chunk_high
+
+
+def _numeric(model, params, shape, wanted):
+    """The wanted moments, computed in chunks of at most CHUNK_ELEMENTS evaluations"""
+    flat = {key: np.broadcast_to(value, shape).ravel() for key, value in params.items()}
+    size = int(np.prod(shape))
+    order = np.arange(size)
+    if model.kind == 'discrete':
+        rv = model.rv(**flat)
+        low, high = rv.ppf(TAIL).astype(np.int64), rv.isf(TAIL).astype(np.int64)
+        # Neighbouring windows overlap most once sorted, so chunks waste little outside them
+        order = np.lexsort((low, high))
+        chunks = _window_chunks(low[order], high[order])
+    else:
+        step = max(1, CHUNK_ELEMENTS // QUADRATURE_NODES)
+        chunks = ((slice(start, start + step), None, None) for start in range(0, size, step))
+
+    result = {moment: np.empty(size) for moment in wanted}
+    for chunk, low, high in chunks:
+        rv = model.rv(**{key: value[order[chunk]] for key, value in flat.items()})
+        if model.kind == 'discrete':
+            part = _discrete_moments(rv, low, high, wanted)
+        else:
+            part = _continuous_moments(rv, wanted)
+        for moment in wanted:
+            result[moment][order[chunk]] = part[moment]
+    return {moment: values.reshape(shape) for moment, values in result.items()}
+
+
+def tabulate(name, quantiles=QUANTILES, **params):
+    """Moments, entropy, quantiles and support of a univariate model, broadcast over params.
+
+    Each parameter may be a scalar or an array; every result has their
+    broadcast shape, except 'quantiles' which gains a trailing axis of
+    len(quantiles).
+    """
+    model = get_model(name)
+    if model.kind == 'multivariate':
+        raise ValueError(f"{name}: tabulate() supports univariate models only")
+    params = {key: np.asarray(value, dtype=float) for key, value in params.items()}
+    rv = model.rv(**params)
+
+    shape = np.broadcast_shapes(*(value.shape for value in params.values()))
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = CLOSED_FORMS.get(name, lambda **_: {})(**params)
+        missing = set(MOMENTS) - set(result)
+        if missing:
+            result.update(_numeric(model, params, shape, missing))
+        result = {moment: np.broadcast_to(result[moment], shape) * 1.0 for moment in MOMENTS}
+
+        quantiles = np.asarray(quantiles, dtype=float)
+        result['quantile_levels'] = quantiles
+        result['quantiles'] = rv.ppf(quantiles.reshape((-1,) + (1,) * len(shape))).transpose(
+            tuple(range(1, len(shape) + 1)) + (0,))
+        low, high = rv.support()
+        result['support'] = (np.broadcast_to(low, shape) * 1.0, np.broadcast_to(high, shape) * 1.0)
+    return result
+
+
+def _multivariate(name, params):
+    if name == 'multivariate_normal':
+        mean = np.asarray(params['mean'], dtype=float)
+        cov = np.asarray(params['cov'], dtype=float)
+        sign, logdet = np.linalg.slogdet(2 * np.pi * np.e * cov)
+        return {
+            'mean': mean,
+            'covariance': cov,
+            'entropy': 0.5 * logdet if sign > 0 else np.nan,
+            'support': 'ℝ^%d' % len(mean),
+        }
+
+    from .compute import multinomial_pmf_compositions
+    n, p = params['n'], np.asarray(params['p'], dtype=float)
+    _, pmf = multinomial_pmf_compositions(n, p)
+    return {
+        'mean': n * p,
+        'covariance': n * (np.diag(p) - np.outer(p, p)),
+        'entropy': -_xlogx(pmf).sum(),
+        'support': f'counts ≥ 0 summing to {n}',
+    }
+
+
+_memo = LRUCache(max_entries=MEMO_SIZE)
+
+
+def _univariate(name, params, quantiles):
+    result = tabulate(name, quantiles, **params)
+    return {
+        **{moment: float(result[moment]) for moment in MOMENTS},
+        'quantiles': dict(zip(quantiles, result['quantiles'].tolist())),
+        'support': tuple(float(bound) for bound in result['support']),
+    }
+
+
+def properties(name, quantiles=QUANTILES, **params):
+    """Properties for one parameter tuple, memoized. Multivariate models report mean, covariance and entropy."""
+    model = get_model(name)
+    model.check(params)
+    key = (name, freeze(params), tuple(quantiles))
+    if model.kind == 'multivariate':
+        return _memo.get_or_compute(key, lambda: _multivariate(name, params))
+    return _memo.get_or_compute(key, lambda: _univariate(name, params, tuple(quantiles)))
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+from typing import Optional
+import numpy as np
+
+
+@dataclass
+class SampleStats:
+    """Mergeable summary of a batch of values: Welford count/mean/M2 and an optional fixed-bin histogram"""
+    count: int
+    mean: float
+    m2: float
+    histogram: Optional[np.ndarray] = None
+    edges: Optional[np.ndarray] = None
+
+    @classmethod
+    def from_values(cls, values, edges=None):
+        values = np.asarray(values, dtype=float)
+        mean = float(values.mean())
+        m2 = float(np.sum((values - mean) ** 2))
+        histogram = np.histogram(values, bins=edges)[0] if edges is not None else None
+        return cls(len(values), mean, m2, histogram, edges)
+
+    def merge(self, other):
+        # Chan et al. pairwise update, stable for any split of the data
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        mean = self.mean + delta * other.count / count
+        m2 = self.m2 + other.m2 + delta**2 * self.count * other.count / count
+        histogram = None
+        if self.histogram is not None and other.histogram is not None:
+            histogram = self.histogram + other.histogram
+        return SampleStats(count, mean, m2, histogram, self.edges)
+
+    @staticmethod
+    def merge_all(partials):
+        partials = iter(partials)
+        result = next(partials)
+        for partial in partials:
+            result = result.merge(partial)
+        return result
+
+    @property
+    def variance(self):
+        return self.m2 / self.count
+
+    @property
+    def std(self):
+        return np.sqrt(self.variance)
+
+    @property
+    def outside(self):
+        """Number of values that fell outside the histogram's edges"""
+        return self.count - int(self.histogram.sum())
+
+    def density(self):
+        """Histogram as a density of all count values, so values outside the edges lower every bin"""
+        return self.histogram / (self.count * np.diff(self.edges))
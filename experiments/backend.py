@@ -0,0 +1,95 @@
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import numpy as np
+
+BACKEND_ENV = 'PROBABILITY_EXPLORER_BACKEND'
+WORKERS_ENV = 'PROBABILITY_EXPLORER_WORKERS'
+
+
+class Backend(ABC):
+    @abstractmethod
+    def imap(self, fn, tasks):
+        """Apply fn(*task) to every task, yielding the results in order"""
+        pass
+
+    def map(self, fn, tasks):
+        return list(self.imap(fn, tasks))
+
+
+class SerialBackend(Backend):
+    def imap(self, fn, tasks):
+        return (fn(*task) for task in tasks)
+
+
+class PoolBackend(Backend):
+    executor_class = None
+
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self._executor = None
+
+    def imap(self, fn, tasks):
+        if self._executor is None:
+            self._executor = self.executor_class(max_workers=self.workers)
+        return self._executor.map(fn, *zip(*tasks))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+
+class ThreadBackend(PoolBackend):
+    """numpy releases the GIL inside generators and reductions, so threads scale for large chunks"""
+    executor_class = ThreadPoolExecutor
+
+
+class ProcessBackend(PoolBackend):
+    """Chunk functions and their arguments must be picklable (module-level functions)"""
+    executor_class = ProcessPoolExecutor
+
+
+BACKENDS = {
+    'serial': SerialBackend,
+    'thread': ThreadBackend,
+    'process': ProcessBackend,
+}
+
+_default_backend = None
+
+
+def get_backend():
+    """Process-wide backend chosen by PROBABILITY_EXPLORER_BACKEND (serial by default)"""
+    global _default_backend
+    if _default_backend is None:
+        name = os.environ.get(BACKEND_ENV, 'serial')
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown backend: {name}")
+        if name == 'serial':
+            _default_backend = SerialBackend()
+        else:
+            workers = os.environ.get(WORKERS_ENV)
+            _default_backend = BACKENDS[name](int(workers) if workers else None)
+    return _default_backend
+
+
+def chunk_sizes(total, chunk_size):
+    return [min(chunk_size, total - start) for start in range(0, total, chunk_size)]
+
+
+def run_chunked(fn, total, seed_sequence, chunk_size, *args, backend=None):
+    """Split a job of `total` items into chunks and run fn(*args, size, seed) for each.
+
+    Every chunk gets its own child of seed_sequence, and chunking depends only on
+    chunk_size, so results are identical whichever backend or worker count runs them.
+    Results are yielded in chunk order as they complete.
+    """
+    backend = backend or get_backend()
+    sizes = chunk_sizes(total, chunk_size)
+    seeds = seed_sequence.spawn(len(sizes))
+    return backend.imap(fn, [(*args, size, seed) for size, seed in zip(sizes, seeds)])
+
+
+def chunk_generator(seed):
+    return np.random.Generator(np.random.PCG64(seed))
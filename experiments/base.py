@@ -1,5 +1,15 @@
 from abc import ABC, abstractmethod
+import numpy as np
 import streamlit as st
+from .rng import session_rng
+
+# Floor for timings, so a run too fast for the clock doesn't divide by zero
+MIN_SECONDS = 1e-9
+
+
+def show_throughput(count, seconds, unit):
+    st.metric("Throughput", f"{count / max(seconds, MIN_SECONDS):,.0f} {unit}/s")
+
 
 class Experiment(ABC):
     @abstractmethod
@@ -12,4 +22,12 @@ class Experiment(ABC):
     
     @property
     def name(self) -> str:
-        return self.__class__.__name__.replace('Experiment', '')
\ No newline at end of file
+        return self.__class__.__name__.replace('Experiment', '')
+
+    def generator(self) -> np.random.Generator:
+        """Fresh generator for this run, derived from the session seed and the experiment name"""
+        return session_rng().generator(self.name)
+
+    def seed_sequence(self) -> np.random.SeedSequence:
+        """Session SeedSequence for this experiment, to spawn per-chunk seeds from"""
+        return session_rng().seed_sequence(self.name)
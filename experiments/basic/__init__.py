@@ -1,16 +1,11 @@
-from .central_limit import CentralLimitExperiment
-from .t_test import TTestExperiment
-from .markov_chain import MarkovChainExperiment
-from .random_walk import RandomWalkExperiment
-from .coin_flip import CoinFlipExperiment
-from .dice_experiment import DiceExperiment
-from .monte_carlo_pi import MonteCarloExperiment
-__all__ = [
-    "CentralLimitExperiment",
-    "TTestExperiment",
-    "MarkovChainExperiment",
-    "RandomWalkExperiment",
-    "CoinFlipExperiment",
-    "DiceExperiment",
-    "MonteCarloExperiment",
-]
+from lazy_imports import lazy_exports
+
+__getattr__, __all__ = lazy_exports(__name__, {
+    "CentralLimitExperiment": ".central_limit",
+    "TTestExperiment": ".t_test",
+    "MarkovChainExperiment": ".markov_chain",
+    "RandomWalkExperiment": ".random_walk",
+    "CoinFlipExperiment": ".coin_flip",
+    "DiceExperiment": ".dice_experiment",
+    "MonteCarloExperiment": ".monte_carlo_pi",
+})
@@ -1,45 +1,85 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from ..accumulators import SampleStats
+from ..backend import chunk_generator, run_chunked
 from ..base import Experiment
+from ui.figures import session_figure
 import streamlit as st
 
+# Mean, variance and support bounds of each source distribution
+SOURCES = {
+    "Uniform": (0.5, 1 / 12, 0.0, 1.0),
+    "Exponential": (1.0, 1.0, 0.0, np.inf),
+    "Poisson": (1.0, 1.0, 0.0, np.inf),
+}
+ELEMENTS_PER_CHUNK = 2**20
+HISTOGRAM_BINS = 30
+
+
+def sample_mean_edges(distribution, sample_size):
+    """Fixed histogram edges covering ±4 standard errors of the sample mean, within the support"""
+    mean, variance, low, high = SOURCES[distribution]
+    se = np.sqrt(variance / sample_size)
+    return np.linspace(max(mean - 4 * se, low), min(mean + 4 * se, high), HISTOGRAM_BINS + 1)
+
+
+def sample_means_chunk(distribution, sample_size, edges, num_samples, seed):
+    """Draw one block of samples, reduce it to its row means and summarize those right away"""
+    rng = chunk_generator(seed)
+    shape = (num_samples, sample_size)
+    if distribution == "Uniform":
+        samples = rng.uniform(0, 1, shape)
+    elif distribution == "Exponential":
+        samples = rng.exponential(1, shape)
+    else:  # Poisson
+        samples = rng.poisson(1, shape)
+    return SampleStats.from_values(samples.mean(axis=1), edges)
+
+
 class CentralLimitExperiment(Experiment):
     def run(self):
         col1, col2, col3 = st.columns([1, 1, 1])
         
         with col1:
-            num_samples = st.slider("Number of samples", 100, 10000, 1000)
-            sample_size = st.slider("Sample size", 1, 100, 30)
+            num_samples = st.select_slider(
+                "Number of samples",
+                options=[10**k for k in range(2, 7)],
+                value=1000,
+                format_func=lambda n: f"{n:,}",
+            )
+            sample_size = st.slider("Sample size", 1, 5000, 30)
             distribution = st.selectbox(
                 "Distribution",
                 ["Uniform", "Exponential", "Poisson"]
             )
             
-            # Generate samples based on selected distribution
-            if distribution == "Uniform":
-                samples = np.random.uniform(0, 1, (num_samples, sample_size))
-            elif distribution == "Exponential":
-                samples = np.random.exponential(1, (num_samples, sample_size))
-            else:  # Poisson
-                samples = np.random.poisson(1, (num_samples, sample_size))
-                
-            # Calculate sample means
-            sample_means = np.mean(samples, axis=1)
-            
-            # Calculate statistics
-            population_mean = np.mean(sample_means)
-            population_std = np.std(sample_means)
+            # Stream blocks of samples through the backend, keeping only merged
+            # Welford moments and a fixed-bin histogram of the means
+            edges = sample_mean_edges(distribution, sample_size)
+            stats = SampleStats.merge_all(run_chunked(
+                sample_means_chunk, num_samples, self.seed_sequence(),
+                max(1, ELEMENTS_PER_CHUNK // sample_size),
+                distribution, sample_size, edges,
+            ))
+            population_mean = stats.mean
+            population_std = stats.std
             
             st.metric("Sample Mean", f"{population_mean:.4f}")
             st.metric("Sample Standard Deviation", f"{population_std:.4f}")
             
         with col2:
-            fig, ax = plt.subplots()
-            ax.hist(sample_means, bins=30, density=True)
-            ax.set_xlabel('Sample Mean')
-            ax.set_ylabel('Density')
-            ax.set_title(f'Distribution of Sample Means\n({distribution} Distribution)')
-            st.pyplot(fig)
+            with session_figure() as (fig, ax):
+                ax.stairs(stats.density(), stats.edges, fill=True, alpha=0.7, label='Sample means')
+                mean, variance, _, _ = SOURCES[distribution]
+                x = np.linspace(edges[0], edges[-1], 200)
+                se2 = variance / sample_size
+                ax.plot(x, np.exp(-(x - mean)**2 / (2 * se2)) / np.sqrt(2 * np.pi * se2), 'k',
+                        label=f'N(μ, σ²/n) = N({mean:g}, {variance / sample_size:.4g})')
+                ax.legend()
+                ax.set_xlabel('Sample Mean')
+                ax.set_ylabel('Density')
+                ax.set_title(f'Distribution of Sample Means\n({distribution} Distribution)')
+            if stats.outside:
+                st.caption(f"{stats.outside / stats.count:.2%} of the sample means lie beyond the plotted range")
             
         with col3:
             st.write("Central Limit Theorem Properties:")
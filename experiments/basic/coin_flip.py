@@ -1,37 +1,204 @@
+import time
+from typing import NamedTuple
 import numpy as np
-import matplotlib.pyplot as plt
-from ..base import Experiment
+from ..base import Experiment, show_throughput
+from ui.figures import session_figure
 import streamlit as st
 
+# Flips are drawn as 64-bit words, CHUNK_WORDS words at a time
+CHUNK_WORDS = 2**20
+CHECKPOINTS = 200
+# p is used to double precision, rounded to a multiple of 2**-PRECISION_BITS
+PRECISION_BITS = 53
+ALL_BITS = np.uint64(2**64 - 1)
+# Set bits per byte value, for numpy versions without np.bitwise_count
+BYTE_POPCOUNT = np.array([bin(byte).count('1') for byte in range(256)], dtype=np.uint8)
+CONFIDENCE = 0.95
+Z = 1.959963984540054  # standard normal quantile for CONFIDENCE
+
+
+class CoinFlips(NamedTuple):
+    heads: int
+    total: int
+    p: float
+    checkpoints: np.ndarray
+    running_heads: np.ndarray
+    seconds: float
+
+    @property
+    def proportion(self):
+        return self.heads / self.total
+
+    @property
+    def running_proportion(self):
+        return self.running_heads / self.checkpoints
+
+
+def bias_bits(p, precision=PRECISION_BITS):
+    """Binary digits of p after the point, most significant first, with trailing zeros dropped"""
+    q = int(round(p * 2**precision))
+    if q in (0, 2**precision):
+        return None
+    bits = [(q >> (precision - 1 - i)) & 1 for i in range(precision)]
+    while not bits[-1]:
+        bits.pop()
+    return bits
+
+
+def flip_words(rng, size, bits):
+    """size words whose bits are each 1 with probability 0.b₁b₂…b_k (binary).
+
+    Each flip compares a uniform U, drawn one fair bit at a time, with the
+    digits of p and is heads if U < p. It is decided at the first digit
+    where the two differ, so only words with undecided bits draw another
+    fair word, about eight words per 64 flips whatever the number of digits.
+    """
+    heads = np.zeros(size, dtype=np.uint64)
+    undecided = np.full(size, ALL_BITS)
+    active = None  # indices of words with undecided bits, once few enough to be worth gathering
+    for bit in bits:
+        if active is None:
+            fair = rng.integers(0, 2**64, size, dtype=np.uint64)
+            if bit:
+                heads |= undecided & ~fair
+                undecided &= fair
+            else:
+                undecided &= ~fair
+            if np.count_nonzero(undecided) < size // 2:
+                active = np.flatnonzero(undecided)
+            continue
+        fair = rng.integers(0, 2**64, len(active), dtype=np.uint64)
+        remaining = undecided[active]
+        if bit:
+            heads[active] |= remaining & ~fair
+            remaining &= fair
+        else:
+            remaining &= ~fair
+        undecided[active] = remaining
+        active = active[remaining != 0]
+        if not len(active):
+            break
+    # Flips still undecided matched every digit, so U ≥ p: tails
+    return heads
+
+
+def _popcount(words):
+    """Number of set bits in each uint64 word"""
+    if hasattr(np, 'bitwise_count'):  # numpy >= 2.0
+        return np.bitwise_count(words)
+    return BYTE_POPCOUNT[np.ascontiguousarray(words).view(np.uint8)].reshape(*words.shape, 8).sum(axis=-1, dtype=np.uint8)
+
+
+def _low_bits(count):
+    """Masks keeping the lowest count (1..64) bits of a word"""
+    count = np.asarray(count, dtype=np.uint64)
+    return np.where(count == 64, ALL_BITS, (np.uint64(1) << (count % np.uint64(64))) - np.uint64(1))
+
+
+def flip_coins(num_flips, rng, p=0.5, chunk_words=CHUNK_WORDS):
+    """Stream num_flips flips of a coin with P(heads) = p, keeping only head counts.
+
+    Flip i is bit i % 64 of word i // 64; heads are counted with a popcount per
+    word. The running head count is kept at log-spaced checkpoints.
+    """
+    checkpoints = np.unique(np.geomspace(1, num_flips, CHECKPOINTS).astype(np.int64))
+    running_heads = np.empty(len(checkpoints), dtype=np.int64)
+    bits = bias_bits(p)
+    chunk_size = 64 * chunk_words
+
+    start = time.perf_counter()
+    heads = 0
+    for offset in range(0, num_flips, chunk_size):
+        size = min(chunk_size, num_flips - offset)
+        num_words = -(-size // 64)
+        if bits is None:
+            words = np.full(num_words, 0 if p < 0.5 else ALL_BITS, dtype=np.uint64)
+        else:
+            words = flip_words(rng, num_words, bits)
+        # Flips past num_flips in the last word are not part of the run
+        words[-1] &= _low_bits(size - 64 * (num_words - 1))
+        per_word = _popcount(words)
+
+        in_chunk = (checkpoints > offset) & (checkpoints <= offset + size)
+        if in_chunk.any():
+            local = checkpoints[in_chunk] - offset
+            word = (local - 1) // 64
+            before = np.cumsum(per_word, dtype=np.int64)[word] - per_word[word]
+            running_heads[in_chunk] = heads + before + _popcount(words[word] & _low_bits(local - 64 * word))
+        heads += int(per_word.sum(dtype=np.int64))
+    seconds = time.perf_counter() - start
+
+    return CoinFlips(heads, num_flips, p, checkpoints, running_heads, seconds)
+
+
+def wilson_interval(heads, n, z=Z):
+    """Wilson score interval for a binomial proportion"""
+    proportion = heads / n
+    scale = 1 + z**2 / n
+    center = (proportion + z**2 / (2 * n)) / scale
+    half = z / scale * np.sqrt(proportion * (1 - proportion) / n + z**2 / (4 * n**2))
+    return center - half, center + half
+
+
+def hoeffding_radius(n, confidence=CONFIDENCE):
+    """Deviation of a proportion from p exceeded with probability at most 1 - confidence"""
+    return np.sqrt(np.log(2 / (1 - confidence)) / (2 * n))
+
+
 class CoinFlipExperiment(Experiment):
     def run(self):
         col1, col2, col3 = st.columns([1, 1, 1])
-        
+
         with col1:
-            num_flips = st.slider("Number of flips", 1, 10000, 100)
-            flips = np.random.choice(['Heads', 'Tails'], size=num_flips)
-            unique, counts = np.unique(flips, return_counts=True)
-            probabilities = dict(zip(unique, counts/num_flips))
-            st.metric("Heads Probability", f"{probabilities.get('Heads', 0):.3f}")
-            st.metric("Tails Probability", f"{probabilities.get('Tails', 0):.3f}")
-            
+            num_flips = st.select_slider(
+                "Number of flips",
+                options=[10**k for k in range(0, 10)],
+                value=100,
+                format_func=lambda n: f"{n:,}",
+            )
+            p = st.slider("Probability of heads", 0.0, 1.0, 0.5, 0.01)
+            result = flip_coins(num_flips, self.generator(), p)
+            low, high = wilson_interval(result.heads, num_flips)
+            # One more digit than the standard error resolves
+            digits = max(3, int(np.log10(num_flips) / 2) + 2)
+            st.metric("Heads Proportion", f"{result.proportion:.{digits}f}")
+            st.metric("Tails Proportion", f"{1 - result.proportion:.{digits}f}")
+            st.metric(f"{CONFIDENCE:.0%} Wilson Interval", f"[{low:.{digits}f}, {high:.{digits}f}]")
+            show_throughput(num_flips, result.seconds, "flips")
+
         with col2:
-            fig, ax = plt.subplots()
-            ax.bar(probabilities.keys(), probabilities.values())
-            ax.set_ylabel('Probability')
-            ax.set_title(f'Probability Distribution ({num_flips} flips)')
-            st.pyplot(fig)
-            
+            with session_figure() as (fig, ax):
+                ax.bar(['Heads', 'Tails'], [result.proportion, 1 - result.proportion])
+                ax.set_ylabel('Proportion')
+                ax.set_title(f'Outcomes ({num_flips:,} flips)')
+
+            with session_figure() as (fig, ax):
+                n = result.checkpoints
+                radius = hoeffding_radius(n)
+                wilson_low, wilson_high = wilson_interval(result.running_heads, n)
+                ax.fill_between(n, np.clip(p - radius, 0, 1), np.clip(p + radius, 0, 1),
+                                alpha=0.2, label=f'Hoeffding {CONFIDENCE:.0%} band')
+                ax.fill_between(n, wilson_low, wilson_high, alpha=0.35, label=f'Wilson {CONFIDENCE:.0%} interval')
+                ax.plot(n, result.running_proportion, label='Running proportion')
+                ax.axhline(p, color='black', linestyle='--', linewidth=1)
+                ax.set_xscale('log')
+                ax.set_ylim(0, 1)
+                ax.set_xlabel('Number of flips')
+                ax.set_ylabel('Proportion of heads')
+                ax.set_title('Convergence')
+                ax.legend()
+
         with col3:
             st.write("Coin Flip Properties:")
-            st.write("""
+            st.write(f"""
             - Each flip is independent
-            - Probability of heads = 0.5
-            - Probability of tails = 0.5
-            - Expected value = 0.5
-            - Variance = 0.25
+            - Probability of heads = {p:.2f}
+            - Probability of tails = {1 - p:.2f}
+            - Expected value = {p:.2f}
+            - Variance = {p * (1 - p):.4f}
+            - Hoeffding: P(|p̂ - p| ≥ ε) ≤ 2·exp(-2nε²)
             """)
             st.markdown("📚 **Learn More:** [Coin Flipping Probability](https://en.wikipedia.org/wiki/Coin_flipping#Physics)")
-    
+
     def get_description(self) -> str:
         return "Simulate coin flips and observe probability distribution"
@@ -1,44 +1,182 @@
+import functools
+from typing import NamedTuple
 import numpy as np
-import matplotlib.pyplot as plt
+from distributions.compute import aggregate_bars, bar_widths
+from ..backend import chunk_generator, run_chunked
 from ..base import Experiment
+from ui.figures import session_figure
 import streamlit as st
 
+DIE_FACES = [4, 6, 8, 10, 12, 20, 100]
+MAX_DICE = 500
+# Rolls are simulated die by die: FACES_PER_CHUNK faces per chunk, at most MAX_FACES per run
+FACES_PER_CHUNK = 2**22
+MAX_FACES = 2**28
+MEMO_SIZE = 256
+# The plot covers sums outside which less than 2·PLOT_TAIL of the mass lies
+PLOT_TAIL = 1e-9
+
+
+class DiceSum(NamedTuple):
+    """Exact distribution of a sum of dice: pmf[i] = P(sum = low + i)"""
+    low: int
+    pmf: np.ndarray
+
+    @property
+    def values(self):
+        return np.arange(self.low, self.low + len(self.pmf))
+
+    @property
+    def mean(self):
+        return float(self.values @ self.pmf)
+
+    @property
+    def variance(self):
+        return float((self.values - self.mean)**2 @ self.pmf)
+
+
+def face_probabilities(faces, weights=None):
+    """Normalized probabilities of faces 1..faces, as a tuple so they can key the memo"""
+    weights = np.ones(faces) if weights is None else np.asarray(weights, dtype=float)
+    if len(weights) != faces or (weights < 0).any() or not weights.sum() > 0:
+        raise ValueError(f"Need {faces} non-negative face weights with a positive sum")
+    return tuple((weights / weights.sum()).tolist())
+
+
+def alias_table(pmf):
+    """Walker's alias table (Vose's construction): index i is kept with probability threshold[i], else alias[i]"""
+    scaled = (pmf * len(pmf)).tolist()
+    threshold = np.ones(len(pmf))
+    alias = np.arange(len(pmf))
+    small = [i for i, value in enumerate(scaled) if value < 1]
+    large = [i for i, value in enumerate(scaled) if value >= 1]
+    while small and large:
+        less, more = small.pop(), large.pop()
+        threshold[less] = scaled[less]
+        alias[less] = more
+        scaled[more] -= 1 - scaled[less]
+        (small if scaled[more] < 1 else large).append(more)
+    # Whatever is left over is 1 up to rounding and keeps threshold 1
+    return threshold, alias
+
+
+@functools.lru_cache(maxsize=MEMO_SIZE)
+def sum_distribution(probabilities, num_dice):
+    """Exact pmf of the sum of num_dice independent dice with the given face probabilities, memoized.
+
+    The pmf of a sum is the num_dice-fold convolution of the die's pmf, which
+    is a single pointwise power of its Fourier transform once the die's pmf
+    is zero-padded to the length of the sum's support. Rounding leaves
+    values within about num_dice·1e-16 of the exact ones; negatives are
+    clipped.
+    """
+    die = np.asarray(probabilities)
+    length = num_dice * (len(die) - 1) + 1
+    pmf = np.fft.irfft(np.fft.rfft(die, length)**num_dice, length)
+    np.clip(pmf, 0, None, out=pmf)
+    pmf /= pmf.sum()
+    return DiceSum(num_dice, pmf)
+
+
+def dice_sums_chunk(probabilities, num_dice, num_rolls, seed):
+    """Counts of each sum index over num_rolls rolls of num_dice dice, every die's face drawn on its own.
+
+    Faces are counted from 0, so a roll's sum index is the sum of its faces.
+    Weighted faces are drawn with the alias method from the die's own table.
+    """
+    rng = chunk_generator(seed)
+    faces = len(probabilities)
+    uniform = len(set(probabilities)) == 1
+    if not uniform:
+        threshold, alias = alias_table(np.asarray(probabilities))
+    sums = np.zeros(num_rolls, dtype=np.int32)
+    for _ in range(num_dice):
+        face = rng.integers(0, faces, num_rolls, dtype=np.int16)
+        if not uniform:
+            face = np.where(rng.random(num_rolls) < threshold[face], face, alias[face])
+        sums += face
+    return np.bincount(sums, minlength=num_dice * (faces - 1) + 1)
+
+
+def roll_dice(num_rolls, probabilities, num_dice, seed_sequence, backend=None):
+    """Counts per sum (aligned with sum_distribution(probabilities, num_dice).pmf) of num_rolls simulated rolls.
+
+    The rolls never use the exact distribution, so comparing the two checks
+    the convolution rather than only the sampling noise.
+    """
+    return sum(run_chunked(
+        dice_sums_chunk, num_rolls, seed_sequence, max(1, FACES_PER_CHUNK // num_dice),
+        probabilities, num_dice, backend=backend,
+    ))
+
+
+def total_variation(p, q):
+    return 0.5 * float(np.abs(p - q).sum())
+
+
 class DiceExperiment(Experiment):
     def run(self):
         col1, col2, col3 = st.columns([1, 1, 1])
-        
+
         with col1:
-            num_rolls = st.slider("Number of rolls", 1, 10000, 100)
-            num_dice = st.slider("Number of dice", 1, 4, 1)
-            rolls = np.sum(np.random.randint(1, 7, size=(num_rolls, num_dice)), axis=1)
-            unique, counts = np.unique(rolls, return_counts=True)
-            probabilities = dict(zip(unique, counts/num_rolls))
-            
-            expected_value = np.mean(rolls)
-            variance = np.var(rolls)
-            st.metric("Expected Value", f"{expected_value:.2f}")
-            st.metric("Variance", f"{variance:.2f}")
-            
+            num_rolls = st.select_slider(
+                "Number of rolls",
+                options=[10**k for k in range(0, 9)],
+                value=100,
+                format_func=lambda n: f"{n:,}",
+            )
+            num_dice = st.slider("Number of dice", 1, MAX_DICE, 1)
+            faces = st.selectbox("Faces per die", DIE_FACES, index=DIE_FACES.index(6))
+            weights_text = st.text_input("Face weights (optional)", placeholder="e.g. 1, 1, 1, 1, 1, 3")
+            try:
+                weights = [float(w) for w in weights_text.split(',')] if weights_text.strip() else None
+                probabilities = face_probabilities(faces, weights)
+            except ValueError as e:
+                st.error(f"Ignoring face weights: {e}")
+                probabilities = face_probabilities(faces)
+            if num_rolls * num_dice > MAX_FACES:
+                num_rolls = MAX_FACES // num_dice
+                st.caption(f"Rolling {num_rolls:,} times: a run rolls at most {MAX_FACES:,} dice")
+
+            exact = sum_distribution(probabilities, num_dice)
+            counts = roll_dice(num_rolls, probabilities, num_dice, self.seed_sequence())
+            empirical = counts / num_rolls
+            values = exact.values
+
+            st.metric("Sample Mean", f"{values @ empirical:.2f}", f"exact {exact.mean:.2f}", delta_color="off")
+            sample_variance = (values - values @ empirical)**2 @ empirical
+            st.metric("Sample Variance", f"{sample_variance:.2f}", f"exact {exact.variance:.2f}", delta_color="off")
+            st.metric("Total Variation Distance", f"{total_variation(empirical, exact.pmf):.4f}")
+
         with col2:
-            fig, ax = plt.subplots()
-            ax.bar(probabilities.keys(), probabilities.values())
-            ax.set_xlabel('Sum of Dice')
-            ax.set_ylabel('Probability')
-            ax.set_title(f'Probability Distribution ({num_rolls} rolls, {num_dice} dice)')
-            st.pyplot(fig)
-            
+            with session_figure() as (fig, ax):
+                cdf = np.cumsum(exact.pmf)
+                first = int(np.searchsorted(cdf, PLOT_TAIL))
+                last = int(np.searchsorted(cdf, 1 - PLOT_TAIL))
+                window = slice(first, min(last, len(cdf) - 1) + 1)
+                x, simulated = aggregate_bars(values[window], empirical[window])
+                _, probability = aggregate_bars(values[window], exact.pmf[window])
+                width = x[1] - x[0] if len(x) > 1 else 1
+                ax.bar(x, simulated, width=0.8 * bar_widths(x), alpha=0.6, label='Simulated')
+                ax.step(x, probability, where='mid', color='black', linewidth=1, label='Exact')
+                ax.set_xlabel('Sum of Dice' if width == 1 else f'Sum of Dice ({width:.0f} sums per bar)')
+                ax.set_ylabel('Probability')
+                ax.set_title(f'Probability Distribution ({num_rolls:,} rolls, {num_dice} d{faces})')
+                ax.legend()
+
         with col3:
             st.write("Dice Roll Properties:")
             st.write(f"""
-            - Each die has 6 faces (1-6)
-            - Each roll is independent
+            - Each die has {faces} faces (1-{faces}){', all equally likely' if len(set(probabilities)) == 1 else ''}
+            - Each roll is independent, and every die in it is rolled separately
             - For {num_dice} dice:
                 - Min sum: {num_dice}
-                - Max sum: {6*num_dice}
-                - Theoretical E[X]: {3.5*num_dice:.1f}
-                - Theoretical Var[X]: {(35/12)*num_dice:.2f}
+                - Max sum: {faces * num_dice}
+                - Theoretical E[X]: {exact.mean:.2f}
+                - Theoretical Var[X]: {exact.variance:.2f}
+            - The exact distribution is the {num_dice}-fold convolution of one die's pmf, computed by FFT
             """)
             st.markdown("📚 **Learn More:** [Dice Probability](https://en.wikipedia.org/wiki/Dice#Probability)")
-    
+
     def get_description(self) -> str:
         return "Simulate dice rolls and observe probability distributions"
@@ -1,46 +1,112 @@
+import string
 import numpy as np
-import matplotlib.pyplot as plt
 from ..base import Experiment
+from ui.figures import session_figure
 import streamlit as st
 
+DEFAULT_TRANSITION_MATRIX = np.array([
+    [0.7, 0.2, 0.1],  # A -> A,B,C
+    [0.3, 0.5, 0.2],  # B -> A,B,C
+    [0.2, 0.3, 0.5]   # C -> A,B,C
+])
+UNIFORM_BLOCK_SIZE = 2**20
+
+
+def simulate_markov_chains(transition_matrix, num_steps, num_chains=1, start=0, rng=None):
+    """Simulate independent chains in lockstep, returning (num_chains, num_steps + 1) states.
+
+    Transition rows are turned into CDFs once and uniforms are drawn in large
+    blocks, so each step is a single vectorized comparison across all chains.
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    cdf = np.cumsum(transition_matrix, axis=1)
+    cdf[:, -1] = 1.0
+
+    states = np.empty((num_chains, num_steps + 1), dtype=np.min_scalar_type(len(cdf) - 1))
+    current = np.full(num_chains, start, dtype=np.intp)
+    states[:, 0] = current
+    block = max(1, UNIFORM_BLOCK_SIZE // num_chains)
+    for block_start in range(0, num_steps, block):
+        uniforms = rng.random((min(block, num_steps - block_start), num_chains))
+        for offset, u in enumerate(uniforms, start=block_start + 1):
+            current = (u[:, np.newaxis] >= cdf[current]).sum(axis=1)
+            states[:, offset] = current
+    return states
+
+
+def stationary_distribution(transition_matrix):
+    """Left eigenvector of the transition matrix for eigenvalue 1, normalized to sum to 1"""
+    eigenvalues, eigenvectors = np.linalg.eig(np.transpose(transition_matrix))
+    vector = np.real(eigenvectors[:, np.argmin(np.abs(eigenvalues - 1))])
+    return vector / vector.sum()
+
+
+def state_distribution_after(transition_matrix, steps, start=0):
+    """Exact distribution of the chain after `steps` steps, i.e. row `start` of P^steps"""
+    return np.linalg.matrix_power(transition_matrix, steps)[start]
+
+
+def default_transition_matrix(num_states):
+    if num_states == len(DEFAULT_TRANSITION_MATRIX):
+        return DEFAULT_TRANSITION_MATRIX.copy()
+    matrix = np.full((num_states, num_states), 0.5 / (num_states - 1))
+    np.fill_diagonal(matrix, 0.5)
+    return matrix
+
+
 class MarkovChainExperiment(Experiment):
     def run(self):
         col1, col2, col3 = st.columns([1, 1, 1])
-        
+
         with col1:
-            num_steps = st.slider("Number of steps", 10, 1000, 100)
-            
-            # Define transition matrix
-            states = ['A', 'B', 'C']
-            transition_matrix = np.array([
-                [0.7, 0.2, 0.1],  # A -> A,B,C
-                [0.3, 0.5, 0.2],  # B -> A,B,C 
-                [0.2, 0.3, 0.5]   # C -> A,B,C
-            ])
-            
-            # Simulate Markov chain
-            current_state = 0  # Start in state A
-            states_history = [current_state]
-            
-            for _ in range(num_steps):
-                current_state = np.random.choice(3, p=transition_matrix[current_state])
-                states_history.append(current_state)
-            
-            # Calculate state frequencies
-            unique, counts = np.unique(states_history, return_counts=True)
-            frequencies = dict(zip(states, counts / len(states_history)))
-            
-            for state, freq in frequencies.items():
-                st.metric(f"State {state} Frequency", f"{freq:.3f}")
-            
+            num_states = st.slider("Number of states", 2, 8, 3)
+            num_steps = st.slider("Number of steps", 10, 10000, 100)
+            num_chains = st.slider("Number of parallel chains", 1, 1000, 1)
+            states = list(string.ascii_uppercase[:num_states])
+
+            st.write("Transition matrix (rows are normalized to sum to 1):")
+            edited = st.data_editor(
+                default_transition_matrix(num_states),
+                key=f"markov_matrix_{num_states}",
+            )
+            transition_matrix = np.clip(np.asarray(edited, dtype=float), 0, None)
+            row_sums = transition_matrix.sum(axis=1, keepdims=True)
+            if np.any(row_sums == 0):
+                st.error("Every row needs at least one positive probability")
+                return
+            transition_matrix = transition_matrix / row_sums
+
+            states_history = simulate_markov_chains(transition_matrix, num_steps, num_chains, rng=self.generator())
+
+            # Calculate state frequencies over all chains and steps
+            counts = np.bincount(states_history.ravel(), minlength=num_states)
+            frequencies = counts / states_history.size
+            stationary = stationary_distribution(transition_matrix)
+
+            for state, freq, expected in zip(states, frequencies, stationary):
+                st.metric(f"State {state} Frequency", f"{freq:.3f}", f"{freq - expected:+.3f} vs stationary")
+
         with col2:
-            fig, ax = plt.subplots()
-            ax.plot(range(len(states_history)), [states[s] for s in states_history])
-            ax.set_xlabel('Time Steps')
-            ax.set_ylabel('State')
-            ax.set_title('Markov Chain State Transitions')
-            st.pyplot(fig)
-            
+            with session_figure() as (fig, ax):
+                ax.plot(range(states_history.shape[1]), states_history[0])
+                ax.set_yticks(range(num_states), states)
+                ax.set_xlabel('Time Steps')
+                ax.set_ylabel('State')
+                ax.set_title('Markov Chain State Transitions')
+
+            with session_figure() as (fig, ax):
+                positions = np.arange(num_states)
+                final = np.bincount(states_history[:, -1], minlength=num_states) / num_chains
+                ax.bar(positions - 0.3, frequencies, 0.3, label='Empirical (all steps)')
+                ax.bar(positions, stationary, 0.3, label='Stationary π')
+                ax.bar(positions + 0.3, final, 0.3, label=f'Empirical at step {num_steps}')
+                ax.plot(positions + 0.3, state_distribution_after(transition_matrix, num_steps),
+                        'k_', markersize=20, label=f'Exact row of P^{num_steps}')
+                ax.set_xticks(positions, states)
+                ax.set_ylabel('Probability')
+                ax.set_title(f'State Distribution ({num_chains} chains)')
+                ax.legend()
+
         with col3:
             st.write("Markov Chain Properties:")
             st.write("""
@@ -53,7 +119,9 @@ class MarkovChainExperiment(Experiment):
                 - Natural language processing
                 - Page rank algorithm
             """)
+            st.write("Stationary distribution π (solves πP = π):")
+            st.write({state: round(float(p), 4) for state, p in zip(states, stationary)})
             st.markdown("📚 **Learn More:** [Markov Chain](https://en.wikipedia.org/wiki/Markov_chain)")
-    
+
     def get_description(self) -> str:
         return "Simulate a simple Markov chain and observe state transitions"
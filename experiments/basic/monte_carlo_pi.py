@@ -1,31 +1,111 @@
+import time
+from typing import NamedTuple
 import numpy as np
-import matplotlib.pyplot as plt
-from ..base import Experiment
+from ..base import Experiment, show_throughput
+from ui.figures import session_figure
 import streamlit as st
 
+CHUNK_SIZE = 2**20
+SCATTER_POINTS = 2000
+CHECKPOINTS = 200
+
+
+class PiEstimate(NamedTuple):
+    inside: int
+    total: int
+    checkpoints: np.ndarray
+    running_estimate: np.ndarray
+    sample_x: np.ndarray
+    sample_y: np.ndarray
+    seconds: float
+
+    @property
+    def pi(self):
+        return 4 * self.inside / self.total
+
+
+def estimate_pi(num_points, chunk_size=CHUNK_SIZE, sample_size=SCATTER_POINTS, rng=None):
+    """Stream num_points uniform points through the unit circle test in fixed-size chunks.
+
+    Only running hit counts are kept, plus the running estimate at log-spaced
+    checkpoints and the first sample_size points for the scatter plot (the
+    points are i.i.d., so any prefix is already a uniform sample).
+    """
+    rng = np.random.default_rng() if rng is None else rng
+    checkpoints = np.unique(np.geomspace(1, num_points, CHECKPOINTS).astype(np.int64))
+    running_inside = np.empty(len(checkpoints), dtype=np.int64)
+    sample = None
+
+    start = time.perf_counter()
+    inside = 0
+    for offset in range(0, num_points, chunk_size):
+        size = min(chunk_size, num_points - offset)
+        points = rng.uniform(-1, 1, (2, size))
+        if sample is None:
+            sample = points[:, :sample_size].copy()
+
+        np.square(points, out=points)
+        hits = points[0] + points[1] <= 1
+
+        # Running counts at the checkpoints that fall inside this chunk
+        in_chunk = (checkpoints > offset) & (checkpoints <= offset + size)
+        if in_chunk.any():
+            running_inside[in_chunk] = inside + np.cumsum(hits)[checkpoints[in_chunk] - offset - 1]
+        inside += int(np.count_nonzero(hits))
+    seconds = time.perf_counter() - start
+
+    return PiEstimate(
+        inside=inside,
+        total=num_points,
+        checkpoints=checkpoints,
+        running_estimate=4 * running_inside / checkpoints,
+        sample_x=sample[0],
+        sample_y=sample[1],
+        seconds=seconds,
+    )
+
+
 class MonteCarloExperiment(Experiment):
     def run(self):
         col1, col2, col3 = st.columns([1, 1, 1])
-        
+
         with col1:
-            num_points = st.slider("Number of points", 100, 10000, 1000)
-            x = np.random.uniform(-1, 1, num_points)
-            y = np.random.uniform(-1, 1, num_points)
-            distances = np.sqrt(x**2 + y**2)
-            inside_circle = distances <= 1
-            pi_estimate = 4 * np.sum(inside_circle) / num_points
+            num_points = st.select_slider(
+                "Number of points",
+                options=[10**k for k in range(2, 10)],
+                value=1000,
+                format_func=lambda n: f"{n:,}",
+            )
+            result = estimate_pi(num_points, rng=self.generator())
+            pi_estimate = result.pi
             st.metric("π Estimate", f"{pi_estimate:.6f}")
             st.metric("Actual π", f"{np.pi:.6f}")
             st.metric("Error", f"{abs(pi_estimate - np.pi):.6f}")
-            
+            show_throughput(num_points, result.seconds, "points")
+
         with col2:
-            fig, ax = plt.subplots()
-            ax.scatter(x[inside_circle], y[inside_circle], c='blue', label='Inside')
-            ax.scatter(x[~inside_circle], y[~inside_circle], c='red', label='Outside')
-            ax.set_aspect('equal')
-            ax.legend()
-            st.pyplot(fig)
-            
+            with session_figure() as (fig, ax):
+                x, y = result.sample_x, result.sample_y
+                inside_circle = x**2 + y**2 <= 1
+                ax.scatter(x[inside_circle], y[inside_circle], c='blue', s=4, label='Inside')
+                ax.scatter(x[~inside_circle], y[~inside_circle], c='red', s=4, label='Outside')
+                ax.set_aspect('equal')
+                ax.set_title(f'First {len(x):,} of {num_points:,} points')
+                ax.legend()
+
+            with session_figure() as (fig, ax):
+                n = result.checkpoints
+                p = np.pi / 4
+                band = 1.96 * 4 * np.sqrt(p * (1 - p) / n)
+                ax.fill_between(n, np.pi - band, np.pi + band, alpha=0.3, label='95% band')
+                ax.plot(n, result.running_estimate, label='Running estimate')
+                ax.axhline(np.pi, color='black', linestyle='--', linewidth=1)
+                ax.set_xscale('log')
+                ax.set_xlabel('Number of points')
+                ax.set_ylabel('π estimate')
+                ax.set_title('Convergence')
+                ax.legend()
+
         with col3:
             st.write("Monte Carlo Method Properties:")
             st.write("""
@@ -34,8 +114,9 @@ class MonteCarloExperiment(Experiment):
             - Area of square = (2r)²
             - Ratio = π/4
             - Accuracy improves with more points
+            - Standard error = 4·√(p(1-p)/n), p = π/4
             """)
             st.markdown("📚 **Learn More:** [Monte Carlo Methods](https://en.wikipedia.org/wiki/Monte_Carlo_method)")
-    
+
     def get_description(self) -> str:
-        return "Estimate π using Monte Carlo simulation"
\ No newline at end of file
+        return "Estimate π using Monte Carlo simulation"
@@ -1,48 +1,258 @@
+from dataclasses import dataclass
 import numpy as np
-import matplotlib.pyplot as plt
+from ..accumulators import SampleStats
+from ..backend import chunk_generator, run_chunked
 from ..base import Experiment
+from ui.figures import session_figure
 import streamlit as st
 
+# Positions held at once per chunk (walks × steps × dimensions in one time block)
+ELEMENTS_PER_CHUNK = 2**21
+WALKS_PER_CHUNK = 4096
+# Envelopes and sample paths are recorded at up to TIME_POINTS evenly spaced steps
+TIME_POINTS = 400
+ENVELOPE_BINS = 512
+# Envelope histograms span ENVELOPE_SPAN standard deviations of the position at each time
+ENVELOPE_SPAN = 6
+PERCENTILES = (5, 25, 50, 75, 95)
+SAMPLE_PATHS = 5
+
+
+def record_times(num_steps, points=TIME_POINTS):
+    return np.unique(np.linspace(1, num_steps, min(num_steps, points)).round().astype(np.int64))
+
+
+def envelope_range(times, dims, gaussian):
+    """Histogram bounds at each recorded time: the position for 1-D walks, the distance from the origin otherwise.
+
+    A lattice step has length 1 and a Gaussian step has N(0, 1) coordinates,
+    so E|X_t|² is t or d·t.
+    """
+    spread = ENVELOPE_SPAN * np.sqrt(times * (dims if gaussian else 1))
+    if not gaussian:
+        spread = np.minimum(spread, times)  # a lattice walk is never further than t from the origin
+    return (np.zeros(len(times)) if dims > 1 else -spread), spread
+
+
+def draw_steps(rng, dims, gaussian, num_walks, size):
+    """Steps along each axis in turn: int8 for lattice walks, float32 for Gaussian ones"""
+    if gaussian:
+        for _ in range(dims):
+            yield rng.standard_normal((num_walks, size), dtype=np.float32)
+    elif dims == 1:
+        # One random bit per step, unpacked to 0/1 bytes and mapped to ±1 in place
+        bits = rng.integers(0, 256, (num_walks, (size + 7) // 8), dtype=np.uint8)
+        steps = np.unpackbits(bits, axis=1, count=size).view(np.int8)
+        steps *= 2
+        steps -= 1
+        yield steps
+    else:
+        # Each step moves ±1 along one of the 2d lattice directions
+        direction = rng.integers(0, 2 * dims, (num_walks, size), dtype=np.uint8)
+        for axis in range(dims):
+            yield (direction == 2 * axis).view(np.int8) - (direction == 2 * axis + 1).view(np.int8)
+
+
+@dataclass
+class WalkSummary:
+    """Mergeable results of a batch of walks.
+
+    histograms[i] counts the position (1-D) or distance from the origin at
+    times[i] over ENVELOPE_BINS bins between lows[i] and highs[i]. Per-walk
+    arrays hold the first step at which the distance reached the passage
+    level (-1 if it never did), the largest distance reached and the number
+    of returns to the origin (lattice walks only).
+    """
+    times: np.ndarray
+    lows: np.ndarray
+    highs: np.ndarray
+    histograms: np.ndarray
+    final: SampleStats
+    first_passage: np.ndarray
+    max_excursion: np.ndarray
+    returns: np.ndarray
+    paths: np.ndarray
+
+    def merge(self, other):
+        return WalkSummary(
+            self.times, self.lows, self.highs,
+            self.histograms + other.histograms,
+            self.final.merge(other.final),
+            np.concatenate([self.first_passage, other.first_passage]),
+            np.concatenate([self.max_excursion, other.max_excursion]),
+            np.concatenate([self.returns, other.returns]),
+            np.concatenate([self.paths, other.paths])[:max(len(self.paths), len(other.paths))],
+        )
+
+    @staticmethod
+    def merge_all(partials):
+        partials = iter(partials)
+        result = next(partials)
+        for partial in partials:
+            result = result.merge(partial)
+        return result
+
+    def percentiles(self, percentiles=PERCENTILES):
+        """(len(percentiles), len(times)) envelope, interpolated within histogram bins"""
+        cdf = np.cumsum(self.histograms, axis=1) / self.histograms.sum(axis=1, keepdims=True)
+        cdf = np.hstack([np.zeros((len(cdf), 1)), cdf])
+        levels = np.asarray(percentiles) / 100
+        result = np.empty((len(levels), len(self.times)))
+        for i, (low, high) in enumerate(zip(self.lows, self.highs)):
+            edges = np.linspace(low, high, ENVELOPE_BINS + 1)
+            # First edge at which the cdf reaches each level, so runs of empty bins are skipped
+            j = np.searchsorted(cdf[i], levels, side='left').clip(1, ENVELOPE_BINS)
+            fraction = (levels - cdf[i, j - 1]) / np.maximum(cdf[i, j] - cdf[i, j - 1], 1e-300)
+            result[:, i] = edges[j - 1] + fraction.clip(0, 1) * (edges[j] - edges[j - 1])
+        return result
+
+
+def random_walk_chunk(dims, gaussian, num_steps, level, times, keep, num_walks, seed):
+    """Advance num_walks walks through num_steps steps in time blocks, keeping only running per-walk state.
+
+    Positions for one block are cumulative sums written into a reused buffer
+    and offset by where each walk ended the previous block.
+    """
+    rng = chunk_generator(seed)
+    lows, highs = envelope_range(times, dims, gaussian)
+    histograms = np.zeros((len(times), ENVELOPE_BINS), dtype=np.int64)
+    paths = np.empty((min(keep, num_walks), len(times)))
+    dtype = np.float64 if gaussian else np.int32
+    position = np.zeros((dims, num_walks, 1), dtype=dtype)
+    max_excursion = np.zeros(num_walks)
+    first_passage = np.full(num_walks, -1, dtype=np.int64)
+    returns = np.zeros(num_walks, dtype=np.int64)
+
+    block = max(1, min(num_steps, ELEMENTS_PER_CHUNK // (num_walks * dims)))
+    buffer = np.empty((dims, num_walks, block), dtype=dtype)
+    for start in range(0, num_steps, block):
+        size = min(block, num_steps - start)
+        walks = buffer[:, :, :size]
+        for axis, steps in enumerate(draw_steps(rng, dims, gaussian, num_walks, size)):
+            np.cumsum(steps, axis=1, dtype=dtype, out=walks[axis])
+        walks += position
+        position = walks[:, :, -1:].copy()
+
+        pending = np.flatnonzero(first_passage < 0)
+        if dims == 1:
+            # |X| only where a first passage is still pending; the excursion comes from the extremes
+            distance = None
+            np.maximum(max_excursion, np.maximum(walks[0].max(axis=1), -walks[0].min(axis=1)), out=max_excursion)
+        else:
+            distance = np.square(walks[0], dtype=np.float64)
+            for axis in range(1, dims):
+                distance += np.square(walks[axis], dtype=np.float64)
+            np.sqrt(distance, out=distance)
+            np.maximum(max_excursion, distance.max(axis=1), out=max_excursion)
+
+        if len(pending):
+            hit = (np.abs(walks[0, pending]) if dims == 1 else distance[pending]) >= level
+            reached = hit.any(axis=1)
+            first_passage[pending[reached]] = start + 1 + hit[reached].argmax(axis=1)
+        if not gaussian:
+            at_origin = walks[0] == 0
+            for axis in range(1, dims):
+                at_origin &= walks[axis] == 0
+            returns += np.count_nonzero(at_origin, axis=1)
+
+        recorded = np.flatnonzero((times > start) & (times <= start + size))
+        if len(recorded):
+            values = (walks[0] if dims == 1 else distance)[:, times[recorded] - start - 1]
+            scaled = (values - lows[recorded]) / (highs[recorded] - lows[recorded]) * ENVELOPE_BINS
+            bins = np.clip(scaled.astype(np.int64), 0, ENVELOPE_BINS - 1) + np.arange(len(recorded)) * ENVELOPE_BINS
+            histograms[recorded] += np.bincount(bins.ravel(), minlength=len(recorded) * ENVELOPE_BINS).reshape(-1, ENVELOPE_BINS)
+            paths[:, recorded] = values[:len(paths)]
+
+    final = walks[0, :, -1] if dims == 1 else distance[:, -1]
+    return WalkSummary(times, lows, highs, histograms, SampleStats.from_values(final),
+                       first_passage, max_excursion, returns, paths)
+
+
+def simulate_walks(num_walks, num_steps, seed_sequence, dims=1, gaussian=False, level=None, keep=SAMPLE_PATHS, backend=None):
+    """Summary of num_walks independent walks, streamed through the backend WALKS_PER_CHUNK walks at a time.
+
+    level is the distance whose first-passage time is recorded, √num_steps by default.
+    """
+    level = np.sqrt(num_steps) if level is None else level
+    return WalkSummary.merge_all(run_chunked(
+        random_walk_chunk, num_walks, seed_sequence, WALKS_PER_CHUNK,
+        dims, gaussian, num_steps, level, record_times(num_steps), keep,
+        backend=backend,
+    ))
+
+
 class RandomWalkExperiment(Experiment):
     def run(self):
         col1, col2, col3 = st.columns([1, 1, 1])
-        
+
         with col1:
-            num_steps = st.slider("Number of steps", 1, 1000, 100)
-            num_walks = st.slider("Number of walks", 1, 100, 10)
-            
-            # Generate random walks
-            steps = np.random.choice([-1, 1], size=(num_walks, num_steps))
-            walks = np.cumsum(steps, axis=1)
-            
-            # Calculate statistics
-            final_positions = walks[:, -1]
-            mean_position = np.mean(final_positions)
-            std_position = np.std(final_positions)
-            
-            st.metric("Mean Final Position", f"{mean_position:.2f}")
-            st.metric("Standard Deviation", f"{std_position:.2f}")
-            
+            walk_type = st.selectbox("Step distribution", ["Lattice (±1)", "Gaussian"])
+            gaussian = walk_type == "Gaussian"
+            dims = st.slider("Dimensions", 1, 3, 1)
+            num_steps = st.select_slider(
+                "Number of steps",
+                options=[10**k for k in range(1, 6)],
+                value=100,
+                format_func=lambda n: f"{n:,}",
+            )
+            num_walks = st.select_slider(
+                "Number of walks",
+                options=[10**k for k in range(0, 6)],
+                value=10,
+                format_func=lambda n: f"{n:,}",
+            )
+            level = st.slider("First-passage distance", 1, num_steps, int(np.ceil(np.sqrt(num_steps))))
+
+            summary = simulate_walks(num_walks, num_steps, self.seed_sequence(), dims, gaussian, level)
+            reached = summary.first_passage >= 0
+            quantity = "Position" if dims == 1 else "Distance"
+
+            st.metric(f"Mean Final {quantity}", f"{summary.final.mean:.2f}")
+            st.metric(f"Standard Deviation of Final {quantity}", f"{summary.final.std:.2f}")
+            st.metric(f"Reached Distance {level}", f"{reached.mean():.1%}")
+            if reached.any():
+                st.metric("Median First-Passage Time", f"{np.median(summary.first_passage[reached]):,.0f} steps")
+            st.metric("Mean Maximum Excursion", f"{summary.max_excursion.mean():.2f}")
+            if not gaussian:
+                st.metric("Mean Returns to Origin", f"{summary.returns.mean():.2f}")
+
         with col2:
-            fig, ax = plt.subplots()
-            time_points = np.arange(num_steps)
-            for walk in walks:
-                ax.plot(time_points, walk, alpha=0.5)
-            ax.set_xlabel('Time Steps')
-            ax.set_ylabel('Position')
-            ax.set_title(f'Random Walks (n={num_walks})')
-            st.pyplot(fig)
-            
+            times = summary.times
+            with session_figure() as (fig, ax):
+                low, q1, median, q3, high = summary.percentiles()
+                ax.fill_between(times, low, high, alpha=0.2, label='5–95%')
+                ax.fill_between(times, q1, q3, alpha=0.35, label='25–75%')
+                ax.plot(times, median, label='Median')
+                for path in summary.paths:
+                    ax.plot(times, path, alpha=0.5, linewidth=0.8)
+                if dims == 1:
+                    spread = np.sqrt(times)
+                    ax.plot(times, spread, 'k--', linewidth=0.8, label='±√t')
+                    ax.plot(times, -spread, 'k--', linewidth=0.8)
+                ax.set_xlabel('Time Steps')
+                ax.set_ylabel(quantity if dims == 1 else 'Distance from Origin')
+                ax.set_title(f'Random Walks (n={num_walks:,}, {len(summary.paths)} shown)')
+                ax.legend()
+
+            if reached.any():
+                with session_figure() as (fig, ax):
+                    ax.hist(summary.first_passage[reached], bins=50)
+                    ax.set_xlabel('Steps')
+                    ax.set_ylabel('Walks')
+                    ax.set_title(f'First-Passage Time to Distance {level}')
+
         with col3:
             st.write("Random Walk Properties:")
             st.write("""
             - Each step is independent
-            - Equal probability of +1 or -1 step
+            - Lattice walks move ±1 along one axis per step
+            - Gaussian walks take N(0, 1) steps on every axis
             - Expected final position = 0
             - Variance grows with number of steps
             - Distance from origin ~ √n steps
+            - 1-D and 2-D lattice walks return to the origin with probability 1; 3-D ones need not
             """)
             st.markdown("📚 **Learn More:** [Random Walk](https://en.wikipedia.org/wiki/Random_walk)")
-    
+
     def get_description(self) -> str:
         return "Simulate random walks and observe their statistical properties"
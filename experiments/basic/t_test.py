@@ -1,40 +1,104 @@
 import numpy as np
-import matplotlib.pyplot as plt
+from ..backend import chunk_generator, run_chunked
 from ..base import Experiment
+from ui.figures import session_figure
 import streamlit as st
 from scipy import stats
 
+ALPHAS = [0.01, 0.05, 0.1]
+# Power is simulated on a grid of POWER_SIZES log-spaced sample sizes × POWER_EFFECTS effect sizes
+POWER_SIZES = 8
+POWER_EFFECTS = 12
+MIN_SAMPLE_SIZE = 5
+ELEMENTS_PER_CHUNK = 2**22
+
+
+def two_sample_t_test(sample_size, effect_size, rng):
+    """Draw N(0, 1) and N(effect_size, 1) samples and compare their means with Student's t-test"""
+    sample1 = rng.normal(0, 1, sample_size)
+    sample2 = rng.normal(effect_size, 1, sample_size)
+    t_stat, p_value = stats.ttest_ind(sample1, sample2)
+    return sample1, sample2, t_stat, p_value
+
+
+def power_grid(max_sample_size, max_effect_size, sizes=POWER_SIZES, effects=POWER_EFFECTS):
+    """Per-group sample sizes and effect sizes at which power is estimated"""
+    sample_sizes = np.unique(np.geomspace(MIN_SAMPLE_SIZE, max_sample_size, sizes).round().astype(np.int64))
+    return sample_sizes, np.linspace(0, max_effect_size, effects)
+
+
+def rejections_chunk(sample_sizes, effect_sizes, alpha, num_replications, seed):
+    """Number of the num_replications two-sided tests at level alpha that reject, per (sample size, effect size).
+
+    Each replication draws both groups' noise as one row of a 2-D array and
+    reduces it to its means and variances along the rows. The effect only
+    shifts the second group's mean, so one draw serves every effect size.
+    """
+    rng = chunk_generator(seed)
+    rejections = np.zeros((len(sample_sizes), len(effect_sizes)), dtype=np.int64)
+    for i, n in enumerate(sample_sizes):
+        noise = rng.standard_normal((2, num_replications, n), dtype=np.float32)
+        sums = noise.sum(axis=2, dtype=np.float64)
+        squares = np.einsum('gij,gij->gi', noise, noise, dtype=np.float64)
+        means = sums / n
+        variances = (squares - sums * means) / (n - 1)
+        standard_error = np.sqrt((variances[0] + variances[1]) / n)
+        difference = (means[1] - means[0])[:, np.newaxis] + effect_sizes
+        critical = stats.t.isf(alpha / 2, 2 * n - 2)
+        rejections[i] = np.count_nonzero(np.abs(difference) > critical * standard_error[:, np.newaxis], axis=0)
+    return rejections
+
+
+def simulated_power(sample_sizes, effect_sizes, alpha, num_replications, seed_sequence, backend=None):
+    """Share of num_replications simulated t-tests that reject, shape (len(sample_sizes), len(effect_sizes))"""
+    replications_per_chunk = max(1, ELEMENTS_PER_CHUNK // (2 * int(np.max(sample_sizes))))
+    rejections = sum(run_chunked(
+        rejections_chunk, num_replications, seed_sequence, replications_per_chunk,
+        sample_sizes, effect_sizes, alpha, backend=backend,
+    ))
+    return rejections / num_replications
+
+
+def analytic_power(sample_sizes, effect_sizes, alpha):
+    """Exact power of the two-sided equal-variance t-test from the noncentral t distribution"""
+    n = np.asarray(sample_sizes)[:, np.newaxis]
+    df = 2 * n - 2
+    noncentrality = np.asarray(effect_sizes) * np.sqrt(n / 2)
+    critical = stats.t.isf(alpha / 2, df)
+    # P(T < -c; δ) = P(T > c; -δ): scipy's lower-tail cdf returns nan where it underflows
+    return stats.nct.sf(critical, df, noncentrality) + stats.nct.sf(critical, df, -noncentrality)
+
+
 class TTestExperiment(Experiment):
     def run(self):
+        mode = st.radio("Mode", ["Single test", "Power analysis"], horizontal=True)
+        if mode == "Power analysis":
+            self.run_power_analysis()
+            return
+
         col1, col2, col3 = st.columns([1, 1, 1])
-        
+
         with col1:
             sample_size = st.slider("Sample size", 10, 1000, 100)
             effect_size = st.slider("Effect size", 0.0, 2.0, 0.5)
-            
-            # Generate two samples
-            sample1 = np.random.normal(0, 1, sample_size)
-            sample2 = np.random.normal(effect_size, 1, sample_size)
-            
-            # Perform t-test
-            t_stat, p_value = stats.ttest_ind(sample1, sample2)
-            
+
+            sample1, sample2, t_stat, p_value = two_sample_t_test(sample_size, effect_size, self.generator())
+
             st.metric("t-statistic", f"{t_stat:.4f}")
             st.metric("p-value", f"{p_value:.4f}")
             st.metric("Significant?", "Yes" if p_value < 0.05 else "No")
-            
+
         with col2:
-            fig, ax = plt.subplots()
-            ax.hist(sample1, bins=30, alpha=0.5, label='Sample 1')
-            ax.hist(sample2, bins=30, alpha=0.5, label='Sample 2')
-            ax.axvline(np.mean(sample1), color='blue', linestyle='--')
-            ax.axvline(np.mean(sample2), color='orange', linestyle='--')
-            ax.set_xlabel('Value')
-            ax.set_ylabel('Frequency')
-            ax.set_title('Sample Distributions')
-            ax.legend()
-            st.pyplot(fig)
-            
+            with session_figure() as (fig, ax):
+                ax.hist(sample1, bins=30, alpha=0.5, label='Sample 1')
+                ax.hist(sample2, bins=30, alpha=0.5, label='Sample 2')
+                ax.axvline(np.mean(sample1), color='blue', linestyle='--')
+                ax.axvline(np.mean(sample2), color='orange', linestyle='--')
+                ax.set_xlabel('Value')
+                ax.set_ylabel('Frequency')
+                ax.set_title('Sample Distributions')
+                ax.legend()
+
         with col3:
             st.write("T-Test Properties:")
             st.write("""
@@ -45,6 +109,55 @@ class TTestExperiment(Experiment):
             - Effect size impacts test power
             """)
             st.markdown("📚 **Learn More:** [Student's t-test](https://en.wikipedia.org/wiki/Student%27s_t-test)")
-    
+
+    def run_power_analysis(self):
+        col1, col2, col3 = st.columns([1, 1, 1])
+
+        with col1:
+            max_sample_size = st.slider("Largest sample size", 10, 1000, 200)
+            max_effect_size = st.slider("Largest effect size", 0.1, 2.0, 1.0)
+            alpha = st.select_slider("Significance level α", options=ALPHAS, value=0.05)
+            num_replications = st.select_slider(
+                "Replications per cell",
+                options=[100, 1000, 10000],
+                value=1000,
+                format_func=lambda n: f"{n:,}",
+            )
+
+            sample_sizes, effect_sizes = power_grid(max_sample_size, max_effect_size)
+            simulated = simulated_power(sample_sizes, effect_sizes, alpha, num_replications, self.seed_sequence())
+            analytic = analytic_power(sample_sizes, effect_sizes, alpha)
+            # Binomial standard error of a simulated power, at its largest (power = 1/2)
+            standard_error = 0.5 / np.sqrt(num_replications)
+
+            st.metric("Tests Simulated", f"{simulated.size * num_replications:,}")
+            st.metric("Largest |Simulated - Analytic|", f"{np.abs(simulated - analytic).max():.4f}")
+            st.metric("Monte Carlo Standard Error", f"≤ {standard_error:.4f}")
+            st.metric("Simulated Type I Error", f"{simulated[:, 0].mean():.4f}", f"α = {alpha}", delta_color="off")
+
+        with col2:
+            with session_figure() as (fig, ax):
+                for i, n in enumerate(sample_sizes):
+                    ax.plot(effect_sizes, analytic[i], color=f'C{i}', label=f'n = {n}')
+                    ax.plot(effect_sizes, simulated[i], 'o', color=f'C{i}', markersize=3)
+                ax.axhline(alpha, color='black', linestyle='--', linewidth=0.8)
+                ax.set_ylim(0, 1.02)
+                ax.set_xlabel('Effect size (Cohen\'s d)')
+                ax.set_ylabel('Power')
+                ax.set_title(f'Power at α = {alpha} (lines: noncentral t, dots: simulated)')
+                ax.legend(fontsize='small')
+
+        with col3:
+            st.write("Power Analysis:")
+            st.write(f"""
+            - Power = P(reject H₀ | effect)
+            - Each dot is the share of {num_replications:,} simulated tests that reject
+            - Under H₀ the t statistic has a t distribution with 2n - 2 degrees of freedom
+            - With effect d it has a noncentral t distribution with noncentrality d·√(n/2)
+            - Power grows with both sample size and effect size
+            - At effect size 0 the power is the type I error rate α
+            """)
+            st.markdown("📚 **Learn More:** [Power of a test](https://en.wikipedia.org/wiki/Power_of_a_test)")
+
     def get_description(self) -> str:
         return "Demonstrate Student's t-test for comparing two samples"
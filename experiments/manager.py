@@ -1,28 +1,26 @@
-from typing import Dict, Type
+from typing import Dict
 from .base import Experiment
-from .basic import *
 import streamlit as st
 
 class ExperimentManager:
-    def __init__(self):
-        self.experiments: Dict[str, Type[Experiment]] = {
-            'Coin Flip': CoinFlipExperiment(),
-            "Dice Roll": DiceExperiment(),
-            "Monte Carlo Pi": MonteCarloExperiment(),
-            "Random Walk": RandomWalkExperiment(),
-            "Central Limit Theorem": CentralLimitExperiment(),
-            "Student's t-test": TTestExperiment(),
-            "Markov Chain": MarkovChainExperiment(),
-        }
+    def __init__(self, registry):
+        # Names and classes come from the registry; modules are imported on first run
+        self.registry = registry
+        self.experiments: Dict[str, Experiment] = {}
     
     def get_experiment_names(self):
-        return list(self.experiments.keys())
+        return self.registry.names('experiment')
+
+    def get_experiment(self, name: str) -> Experiment:
+        if name not in self.experiments:
+            spec = self.registry.spec(name)
+            if spec.kind != 'experiment':
+                raise ValueError(f"Unknown experiment: {name}")
+            self.experiments[name] = spec.load()()
+        return self.experiments[name]
     
     def run_experiment(self, name: str):
-        if name not in self.experiments:
-            raise ValueError(f"Unknown experiment: {name}")
-        
-        experiment = self.experiments[name]
+        experiment = self.get_experiment(name)
         st.header(name)
         st.markdown(experiment.get_description())
         experiment.run()
@@ -0,0 +1,35 @@
+import zlib
+import numpy as np
+import streamlit as st
+
+SEED_KEY = 'rng_seed'
+
+
+def new_seed():
+    """Fresh 32-bit seed from OS entropy, small enough to show and type back in"""
+    return int(np.random.SeedSequence().generate_state(1)[0])
+
+
+class RNGService:
+    """Hands out reproducible PCG64 generators derived from one seed.
+
+    Each experiment gets its own stream (the experiment name is mixed into the
+    SeedSequence spawn key), so changing one experiment never shifts another's
+    random numbers. Parallel work splits seed_sequence(name) with run_chunked.
+    """
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    def seed_sequence(self, name):
+        return np.random.SeedSequence(self.seed, spawn_key=(zlib.crc32(name.encode()),))
+
+    def generator(self, name):
+        return np.random.Generator(np.random.PCG64(self.seed_sequence(name)))
+
+
+def session_rng():
+    """RNGService for the current session, seeded from the sidebar seed"""
+    if SEED_KEY not in st.session_state:
+        st.session_state[SEED_KEY] = new_seed()
+    return RNGService(st.session_state[SEED_KEY])
@@ -0,0 +1,243 @@
+"""Opt-in timing of where each rerun spends its time.
+
+Off unless PROBABILITY_EXPLORER_PROFILE is set to one of
+
+    timing        per-phase wall time only
+    cprofile      timing plus a cProfile of the whole rerun
+    pyinstrument  timing plus a pyinstrument profile (if it is installed)
+
+Phases are marked with `with phase('plot'):` anywhere under a rerun();
+nested phases are recorded under dotted names such as 'plot.encode'.
+Outside a rerun, or in other threads (e.g. the render cache warm-up),
+phase() does nothing.
+
+Each finished rerun is written to the 'probability_explorer.timings'
+logger as one JSON line and added to process-wide histograms. Setting
+PROBABILITY_EXPLORER_METRICS_PORT serves those histograms in the
+Prometheus text format at http://<host>:<port>/metrics.
+"""
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import streamlit as st
+
+PROFILE_ENV = 'PROBABILITY_EXPLORER_PROFILE'
+METRICS_PORT_ENV = 'PROBABILITY_EXPLORER_METRICS_PORT'
+PROFILE_MODES = ('off', 'timing', 'cprofile', 'pyinstrument')
+
+# Histogram bucket bounds in seconds, as used by Prometheus client libraries
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+PROFILE_LINES = 25
+
+logger = logging.getLogger('probability_explorer.timings')
+_current = threading.local()
+
+
+def profile_mode():
+    mode = os.environ.get(PROFILE_ENV) or 'off'
+    if mode not in PROFILE_MODES:
+        raise ValueError(f"Unknown profile mode: {mode}")
+    return mode
+
+
+class RerunTimings:
+    """Phase durations of one script run, keyed by dotted phase path in first-entered order"""
+
+    def __init__(self, mode):
+        self.mode = mode
+        self.view = None
+        self.phases = {}
+        self.total = None
+        self.profile = None  # profiler report, text
+        self._stack = []
+
+    @contextmanager
+    def phase(self, name):
+        self._stack.append(name)
+        path = '.'.join(self._stack)
+        self.phases.setdefault(path, 0.0)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.phases[path] += time.perf_counter() - start
+            self._stack.pop()
+
+    def self_times(self):
+        """Time in each phase not spent in its nested phases"""
+        result = dict(self.phases)
+        for path, seconds in self.phases.items():
+            parent = path.rpartition('.')[0]
+            if parent in result:
+                result[parent] -= seconds
+        return result
+
+    def record(self):
+        return {'view': self.view, 'total': self.total, 'phases': self.phases}
+
+
+@contextmanager
+def phase(name):
+    timings = getattr(_current, 'timings', None)
+    if timings is None:
+        yield
+        return
+    with timings.phase(name):
+        yield
+
+
+def set_view(name):
+    """Label the current rerun with what it shows (a distribution or experiment name)"""
+    timings = getattr(_current, 'timings', None)
+    if timings is not None:
+        timings.view = name
+
+
+class Profiler:
+    """cProfile or pyinstrument around a rerun; report() returns its text summary"""
+    _warned = False
+
+    def __init__(self, mode):
+        self.mode = mode
+        self._profiler = None
+
+    def start(self):
+        try:
+            if self.mode == 'pyinstrument':
+                from pyinstrument import Profiler as PyinstrumentProfiler
+                self._profiler = PyinstrumentProfiler()
+                self._profiler.start()
+            else:
+                self._profiler = cProfile.Profile()
+                self._profiler.enable()
+        except ImportError:
+            if not Profiler._warned:
+                logger.warning('pyinstrument is not installed; recording timings only')
+                Profiler._warned = True
+            self._profiler = None
+        except (RuntimeError, ValueError) as e:
+            # Another session's profiler already holds the interpreter-wide hook
+            logger.debug('Profiler unavailable for this rerun: %s', e)
+            self._profiler = None
+
+    def report(self):
+        if self._profiler is None:
+            return None
+        if self.mode == 'pyinstrument':
+            self._profiler.stop()
+            return self._profiler.output_text(unicode=True)
+        self._profiler.disable()
+        out = io.StringIO()
+        pstats.Stats(self._profiler, stream=out).sort_stats('cumulative').print_stats(PROFILE_LINES)
+        return out.getvalue()
+
+
+class Metrics:
+    """Process-wide latency histograms per (view, phase), aggregated across sessions"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms = {}
+
+    def observe(self, timings):
+        samples = dict(timings.phases, total=timings.total)
+        with self._lock:
+            for path, seconds in samples.items():
+                counts, total = self._histograms.get((timings.view, path), ([0] * (len(BUCKETS) + 1), 0.0))
+                for i, bound in enumerate(BUCKETS):
+                    counts[i] += seconds <= bound
+                counts[-1] += 1
+                self._histograms[(timings.view, path)] = (counts, total + seconds)
+
+    def prometheus(self):
+        """Histograms in the Prometheus text exposition format"""
+        lines = [
+            '# HELP probability_explorer_phase_seconds Wall time of each phase of a rerun',
+            '# TYPE probability_explorer_phase_seconds histogram',
+        ]
+        with self._lock:
+            histograms = sorted(self._histograms.items(), key=lambda item: (str(item[0][0]), item[0][1]))
+            for (view, path), (counts, total) in histograms:
+                labels = f'view="{_escape(view or "")}",phase="{_escape(path)}"'
+                for bound, count in zip(BUCKETS + ('+Inf',), counts):
+                    lines.append(f'probability_explorer_phase_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'probability_explorer_phase_seconds_sum{{{labels}}} {total}')
+                lines.append(f'probability_explorer_phase_seconds_count{{{labels}}} {counts[-1]}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def serve_metrics(metrics, port):
+    """Serve metrics.prometheus() at /metrics from a daemon thread"""
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != '/metrics':
+                self.send_error(404)
+                return
+            body = metrics.prometheus().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(('', port), Handler)
+    threading.Thread(target=server.serve_forever, name='metrics-server', daemon=True).start()
+    return server
+
+
+@st.cache_resource
+def get_metrics():
+    """Process-wide Metrics; also starts the /metrics server once if a port is configured"""
+    if not logger.handlers:
+        # One JSON object per line on stderr, whatever the root logger is set to
+        handler = logging.StreamHandler()
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        logger.addHandler(handler)
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+    metrics = Metrics()
+    port = os.environ.get(METRICS_PORT_ENV)
+    if port:
+        try:
+            serve_metrics(metrics, int(port))
+        except OSError as e:
+            logger.warning('Cannot serve metrics on port %s: %s', port, e)
+    return metrics
+
+
+@contextmanager
+def rerun():
+    """Time the enclosed script run; yields its RerunTimings, or None when instrumentation is off"""
+    mode = profile_mode()
+    if mode == 'off':
+        yield None
+        return
+    timings = RerunTimings(mode)
+    profiler = Profiler(mode) if mode != 'timing' else None
+    if profiler is not None:
+        profiler.start()
+    _current.timings = timings
+    start = time.perf_counter()
+    try:
+        yield timings
+    finally:
+        timings.total = time.perf_counter() - start
+        _current.timings = None
+        if profiler is not None:
+            timings.profile = profiler.report()
+        get_metrics().observe(timings)
+        logger.info(json.dumps(timings.record()))
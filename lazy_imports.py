@@ -0,0 +1,16 @@
+"""Package exports that are imported on first attribute access.
+
+The distribution and experiment packages name their classes through
+lazy_exports(), so importing a package does not pull in every distribution
+or experiment (and scipy with them).
+"""
+from importlib import import_module
+
+
+def lazy_exports(package, modules):
+    """A module __getattr__ and __all__ for a package exporting {class name: '.submodule'}"""
+    def __getattr__(name):
+        if name not in modules:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        return getattr(import_module(modules[name], package), name)
+    return __getattr__, list(modules)
@@ -1,10 +1,40 @@
+import numpy as np
 import streamlit as st
-from distributions.continuous import *
-from distributions.discrete import *
 from ui.sidebar import Sidebar
-import matplotlib.pyplot as plt
-import numpy as np
-from experiments.manager import ExperimentManager
+from distributions.base import evaluation_cache
+from distributions.properties import properties
+from instrumentation import phase, rerun, set_view
+from registry import get_registry, get_session_distribution
+from ui.pipeline import plot_cache, plot_image, show_plot
+
+CSS = """
+    <style>
+    .stMarkdown, .stText, .stNumber {
+        font-size: 18px;
+    }
+    .stTitle {
+        font-size: 42px !important;
+    }
+    .stMarkdown h2 {
+        font-size: 32px;
+    }
+    .sidebar .stMarkdown {
+        font-size: 16px;
+    }
+    </style>
+"""
+
+
+def format_value(value):
+    if isinstance(value, str):
+        return value
+    if isinstance(value, np.ndarray):
+        return np.array2string(value, precision=4, suppress_small=True)
+    if np.isnan(value):
+        return 'undefined'
+    if np.isinf(value):
+        return '∞' if value > 0 else '-∞'
+    return f'{value:.6g}'
 
 
 class ProbabilityExplorer:
@@ -16,42 +46,11 @@ class ProbabilityExplorer:
             initial_sidebar_state="expanded"
         )
         
-        st.markdown("""
-            <style>
-            .stMarkdown, .stText, .stNumber {
-                font-size: 18px;
-            }
-            .stTitle {
-                font-size: 42px !important;
-            }
-            .stMarkdown h2 {
-                font-size: 32px;
-            }
-            .sidebar .stMarkdown {
-                font-size: 16px;
-            }
-            </style>
-        """, unsafe_allow_html=True)
+        st.markdown(CSS, unsafe_allow_html=True)
         
         st.title("🌐 Probability Explorer")
         self.formula_col, self.plot_col, self.properties_col = st.columns([1, 1, 1])
-        self.distributions = {
-            'Normal': NormalDistribution(),
-            'Multivariate Normal': MultivariateNormalDistribution(),
-            'Chi-squared': ChiSquaredDistribution(),
-            'Uniform': UniformDistribution(),
-            'Poisson': PoissonDistribution(),
-            'Binomial': BinomialDistribution(),
-            'Multinomial': MultinomialDistribution(),
-            'Exponential': ExponentialDistribution(),
-            'Geometric': GeometricDistribution(),
-            'Bernoulli': BernoulliDistribution(),
-            'Cauchy': CauchyDistribution(),
-            'Gamma': GammaDistribution(),
-            'Hypergeometric': HypergeometricDistribution(),
-            'UniformDiscrete': UniformDiscreteDistribution(),
-        }
-        self.experiment_manager = ExperimentManager()
+        self.registry = get_registry()
         
         
     def run(self):
@@ -72,12 +71,14 @@ class ProbabilityExplorer:
             dist_type = Sidebar.get_distribution_selector(
                 "Continuous" if page == "Continuous Distributions" else "Discrete"
             )
-            distribution = self.distributions[dist_type]
+            distribution = get_session_distribution(dist_type)
+            self.distribution_name = dist_type
+            set_view(dist_type)
             
             st.markdown("---")
             auto_update = st.checkbox('Auto-update plot', value=True)
             
-        with self.formula_col:
+        with self.formula_col, phase('get_parameters'):
             params = distribution.get_parameters()
         if auto_update or st.sidebar.button('Calculate Distribution'):
             try:
@@ -89,10 +90,13 @@ class ProbabilityExplorer:
         with st.sidebar:
             experiment = st.selectbox(
                 "Choose an experiment:",
-                self.experiment_manager.get_experiment_names()
+                self.registry.experiment_manager.get_experiment_names()
             )
-        
-        self.experiment_manager.run_experiment(experiment)
+            Sidebar.get_seed_selector()
+        set_view(experiment)
+
+        with phase('experiment'):
+            self.registry.experiment_manager.run_experiment(experiment)
 
     def show_about_page(self):
         st.header("About project:")
@@ -114,24 +118,51 @@ class ProbabilityExplorer:
         Melnikov Sergey | https://github.com/peplxx/probability-explorer
         ```
         """)
+
+        for label, cache in (('Evaluation cache', evaluation_cache), ('Plot cache', plot_cache)):
+            stats = cache.stats()
+            st.caption(
+                f"{label}: {stats['hits']} hits, {stats['misses']} misses, "
+                f"{stats['entries']} entries, {stats['bytes'] / 2**20:.1f} MiB"
+            )
         
     def display_distribution(self, distribution, params):
         with self.formula_col:
             st.write('Distribution Formula:')
-            st.latex(distribution.get_formula())
+            with phase('formula'):
+                st.latex(distribution.get_formula())
             st.write('Key Parameters:')
             st.write(params)
         with self.plot_col:
             st.write('Distribution Plot:')
-            fig, ax = plt.subplots()
-            plot = distribution.plot(ax)
-            if plot is not None:
-                plt.colorbar(plot, label='Probability Density')
-            st.pyplot(fig)
+            with phase('plot'):
+                show_plot(plot_image(self.distribution_name, distribution, params))
             st.success(icon="🔥", body="Distribution calculated!")
         with self.properties_col:
-            distribution.get_properties(st)
+            with phase('get_properties'):
+                distribution.get_properties(st)
+            with phase('moments'):
+                self.display_moments(distribution, params)
+
+    def display_moments(self, distribution, params):
+        if distribution.model is None:
+            return
+        rows = {}
+        for name, value in properties(distribution.model, **params).items():
+            if name == 'quantiles':
+                rows.update((f'{level:.0%} quantile', format_value(q)) for level, q in value.items())
+            elif name == 'support' and isinstance(value, tuple):
+                low, high = value
+                rows[name] = (f"{'(' if np.isinf(low) else '['}{format_value(low)}, "
+                              f"{format_value(high)}{')' if np.isinf(high) else ']'}")
+            else:
+                rows[name] = format_value(value)
+        st.write('Properties for the current parameters:')
+        st.table({'Property': [name.capitalize() for name in rows], 'Value': list(rows.values())})
 
 if __name__ == "__main__":
-    app = ProbabilityExplorer()
-    app.run()
\ No newline at end of file
+    with rerun() as timings:
+        app = ProbabilityExplorer()
+        app.run()
+    if timings is not None:
+        Sidebar.show_timings(timings)
\ No newline at end of file
@@ -0,0 +1,151 @@
+from dataclasses import asdict, dataclass, field
+from importlib import import_module
+from importlib.metadata import entry_points
+import streamlit as st
+from experiments.manager import ExperimentManager
+
+KINDS = ('continuous', 'discrete', 'experiment')
+
+# Installed packages add to the catalog through these entry point groups, e.g.
+#   [project.entry-points."probability_explorer.continuous"]
+#   "Log-normal" = "acme_distributions.lognormal:LogNormalDistribution"
+ENTRY_POINT_GROUPS = {
+    'continuous': 'probability_explorer.continuous',
+    'discrete': 'probability_explorer.discrete',
+    'experiment': 'probability_explorer.experiments',
+}
+
+
+@dataclass
+class PluginSpec:
+    """A catalog entry: display name, kind and a 'module:Class' target imported on first use"""
+    name: str
+    kind: str
+    target: str
+    _class: type = field(default=None, repr=False, compare=False)
+
+    @property
+    def loaded(self):
+        return self._class is not None
+
+    def load(self):
+        if self._class is None:
+            module, _, class_name = self.target.partition(':')
+            self._class = getattr(import_module(module), class_name)
+        return self._class
+
+    @property
+    def parameters(self):
+        """Parameter schema declared on the class; imports its module but instantiates nothing"""
+        return getattr(self.load(), 'parameters', ())
+
+    def metadata(self, parameters=True):
+        metadata = {'name': self.name, 'kind': self.kind, 'target': self.target}
+        if parameters:
+            metadata['parameters'] = [asdict(parameter) for parameter in self.parameters]
+        return metadata
+
+
+# Built-in catalog, in sidebar order. Nothing here is imported until selected.
+BUILTINS = [
+    PluginSpec('Multivariate Normal', 'continuous', 'distributions.continuous.mutivariative_normal:MultivariateNormalDistribution'),
+    PluginSpec('Normal', 'continuous', 'distributions.continuous.normal:NormalDistribution'),
+    PluginSpec('Chi-squared', 'continuous', 'distributions.continuous.chi_squared:ChiSquaredDistribution'),
+    PluginSpec('Exponential', 'continuous', 'distributions.continuous.exponential:ExponentialDistribution'),
+    PluginSpec('Cauchy', 'continuous', 'distributions.continuous.cauchy:CauchyDistribution'),
+    PluginSpec('Uniform', 'continuous', 'distributions.continuous.uniform:UniformDistribution'),
+    PluginSpec('Gamma', 'continuous', 'distributions.continuous.gamma:GammaDistribution'),
+    PluginSpec('Multinomial', 'discrete', 'distributions.discrete.multinomial:MultinomialDistribution'),
+    PluginSpec('Poisson', 'discrete', 'distributions.discrete.poisson:PoissonDistribution'),
+    PluginSpec('Binomial', 'discrete', 'distributions.discrete.binomial:BinomialDistribution'),
+    PluginSpec('Geometric', 'discrete', 'distributions.discrete.geometric:GeometricDistribution'),
+    PluginSpec('Bernoulli', 'discrete', 'distributions.discrete.bernoulli:BernoulliDistribution'),
+    PluginSpec('Hypergeometric', 'discrete', 'distributions.discrete.hypergeometric:HypergeometricDistribution'),
+    PluginSpec('UniformDiscrete', 'discrete', 'distributions.discrete.uniform:UniformDiscreteDistribution'),
+    PluginSpec('Coin Flip', 'experiment', 'experiments.basic.coin_flip:CoinFlipExperiment'),
+    PluginSpec('Dice Roll', 'experiment', 'experiments.basic.dice_experiment:DiceExperiment'),
+    PluginSpec('Monte Carlo Pi', 'experiment', 'experiments.basic.monte_carlo_pi:MonteCarloExperiment'),
+    PluginSpec('Random Walk', 'experiment', 'experiments.basic.random_walk:RandomWalkExperiment'),
+    PluginSpec('Central Limit Theorem', 'experiment', 'experiments.basic.central_limit:CentralLimitExperiment'),
+    PluginSpec("Student's t-test", 'experiment', 'experiments.basic.t_test:TTestExperiment'),
+    PluginSpec('Markov Chain', 'experiment', 'experiments.basic.markov_chain:MarkovChainExperiment'),
+]
+
+# Filled by the register_* decorators as decorated modules are imported
+_decorated = []
+
+
+def _register(name, kind):
+    if kind not in KINDS:
+        raise ValueError(f"Unknown plugin kind: {kind}")
+
+    def decorator(cls):
+        _decorated.append(PluginSpec(name, kind, f'{cls.__module__}:{cls.__qualname__}', cls))
+        return cls
+    return decorator
+
+
+def register_distribution(name, kind):
+    """Class decorator adding a Distribution subclass to the catalog under `name`"""
+    return _register(name, kind)
+
+
+def register_experiment(name):
+    """Class decorator adding an Experiment subclass to the catalog under `name`"""
+    return _register(name, 'experiment')
+
+
+def discover_entry_points():
+    specs = []
+    for kind, group in ENTRY_POINT_GROUPS.items():
+        for entry_point in entry_points(group=group):
+            specs.append(PluginSpec(entry_point.name, kind, entry_point.value))
+    return specs
+
+
+class Registry:
+    """Distribution and experiment catalogs shared by every session of the process.
+
+    Entries come from BUILTINS, installed entry points and the register_*
+    decorators, in that order; a later entry replaces an earlier one with the
+    same name. Only names and targets are known up front, a class is imported
+    the first time it is selected (or its parameter schema is asked for).
+    """
+
+    def __init__(self):
+        self._static = {spec.name: spec for spec in BUILTINS + discover_entry_points()}
+        # Experiments keep no state between runs, so one instance serves everyone
+        self.experiment_manager = ExperimentManager(self)
+
+    def specs(self, kind=None):
+        specs = dict(self._static)
+        specs.update((spec.name, spec) for spec in _decorated)
+        return [spec for spec in specs.values() if kind is None or spec.kind == kind]
+
+    def names(self, kind):
+        return [spec.name for spec in self.specs(kind)]
+
+    def spec(self, name):
+        for spec in self.specs():
+            if spec.name == name:
+                return spec
+        raise ValueError(f"Unknown plugin: {name}")
+
+    def distribution_class(self, name):
+        return self.spec(name).load()
+
+    def metadata(self, kind=None, parameters=True):
+        return [spec.metadata(parameters) for spec in self.specs(kind)]
+
+
+@st.cache_resource
+def get_registry():
+    return Registry()
+
+
+def get_session_distribution(name):
+    """Per-session Distribution instance, since get_parameters stores widget values on it"""
+    instances = st.session_state.setdefault('distributions', {})
+    if name not in instances:
+        instances[name] = get_registry().distribution_class(name)()
+    return instances[name]
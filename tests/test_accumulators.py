@@ -0,0 +1,66 @@
+import numpy as np
+import pytest
+from experiments.accumulators import SampleStats
+from experiments.backend import SerialBackend, ThreadBackend, chunk_generator, chunk_sizes, run_chunked
+
+TOTAL = 100_003
+CHUNK = 7_000
+# Narrower than the sample, so some values land outside the histogram
+EDGES = np.linspace(-2.0, 3.0, 41)
+
+
+def values_chunk(n, seed):
+    return chunk_generator(seed).normal(0.5, 1.5, n)
+
+
+def stats_chunk(edges, n, seed):
+    return SampleStats.from_values(values_chunk(n, seed), edges)
+
+
+def one_shot(seed):
+    # run_chunked spawns children of a fresh SeedSequence, so the same children regenerate every chunk
+    sizes = chunk_sizes(TOTAL, CHUNK)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    values = np.concatenate([values_chunk(size, child) for size, child in zip(sizes, seeds)])
+    return SampleStats.from_values(values, EDGES)
+
+
+@pytest.fixture(params=['serial', 'thread'])
+def backend(request):
+    if request.param == 'serial':
+        yield SerialBackend()
+    else:
+        backend = ThreadBackend(workers=4)
+        yield backend
+        backend.shutdown()
+
+
+def test_merged_chunks_match_one_shot_stats(backend):
+    merged = SampleStats.merge_all(run_chunked(stats_chunk, TOTAL, np.random.SeedSequence(7), CHUNK, EDGES,
+                                               backend=backend))
+    expected = one_shot(7)
+    assert merged.count == expected.count == TOTAL
+    assert merged.mean == pytest.approx(expected.mean, rel=1e-12)
+    assert merged.m2 == pytest.approx(expected.m2, rel=1e-12)
+    assert merged.variance == pytest.approx(expected.variance, rel=1e-12)
+    np.testing.assert_array_equal(merged.histogram, expected.histogram)
+    assert merged.outside == expected.outside > 0
+    np.testing.assert_allclose(merged.density(), expected.density(), rtol=1e-12)
+
+
+def test_merge_is_independent_of_the_split():
+    values = np.random.default_rng(3).exponential(2.0, 1000)
+    expected = SampleStats.from_values(values, EDGES)
+    for cuts in ([1], [10, 11, 500], [999]):
+        parts = [SampleStats.from_values(part, EDGES) for part in np.split(values, cuts)]
+        merged = SampleStats.merge_all(parts)
+        assert merged.mean == pytest.approx(expected.mean, rel=1e-12)
+        assert merged.m2 == pytest.approx(expected.m2, rel=1e-12)
+        np.testing.assert_array_equal(merged.histogram, expected.histogram)
+        assert merged.outside == expected.outside
+
+
+def test_density_counts_values_outside_the_edges():
+    stats = SampleStats.from_values([0.5, 1.5, 2.5, 10.0], np.array([0.0, 1.0, 2.0, 3.0]))
+    assert stats.outside == 1
+    np.testing.assert_allclose(stats.density(), [0.25, 0.25, 0.25])
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+from experiments.basic.coin_flip import _popcount, bias_bits, flip_coins, flip_words
+
+NUM_WORDS = 2**14
+
+
+def test_bias_bits_are_the_binary_digits_of_p():
+    assert bias_bits(0.375) == [0, 1, 1]
+    assert bias_bits(0.5) == [1]
+    assert bias_bits(0.0) is None
+    assert bias_bits(1.0) is None
+
+
+@pytest.mark.parametrize('numpy_2', [True, False])
+def test_popcount_counts_set_bits(numpy_2, monkeypatch):
+    if not numpy_2:
+        monkeypatch.delattr(np, 'bitwise_count', raising=False)
+    words = np.random.default_rng(0).integers(0, 2**64, 100, dtype=np.uint64)
+    expected = [bin(int(word)).count('1') for word in words]
+    np.testing.assert_array_equal(_popcount(words), expected)
+    np.testing.assert_array_equal(_popcount(words[::3]), expected[::3])
+
+
+@pytest.mark.parametrize('p', [0.5, 0.3, 1 / 3, 0.9, 0.01])
+def test_flip_words_bits_are_heads_with_probability_p(p):
+    words = flip_words(np.random.default_rng(0), NUM_WORDS, bias_bits(p))
+    # Heads per bit position, so a bias confined to some positions shows up too
+    positions = (words[:, np.newaxis] >> np.arange(64, dtype=np.uint64)) & np.uint64(1)
+    per_position = positions.mean(axis=0)
+    standard_error = np.sqrt(p * (1 - p) / NUM_WORDS)
+    assert abs(per_position.mean() - p) < 5 * standard_error / 8
+    assert np.all(np.abs(per_position - p) < 5 * standard_error)
+
+
+@pytest.mark.parametrize('num_flips', [1, 63, 64, 65, 64 * 5 + 7])
+def test_flip_coins_counts_only_num_flips(num_flips):
+    assert flip_coins(num_flips, np.random.default_rng(0), p=1.0, chunk_words=2).heads == num_flips
+    assert flip_coins(num_flips, np.random.default_rng(0), p=0.0, chunk_words=2).heads == 0
+
+
+def test_flip_coins_running_heads_end_at_the_total():
+    flips = flip_coins(10**5 + 3, np.random.default_rng(0), p=0.3, chunk_words=16)
+    assert flips.checkpoints[-1] == flips.total
+    assert flips.running_heads[-1] == flips.heads
+    assert np.all(np.diff(flips.running_heads) >= 0)
@@ -0,0 +1,88 @@
+import warnings
+import numpy as np
+import pytest
+from scipy import stats
+from distributions.compute import (
+    BINOMIAL, GEOMETRIC, HYPERGEOMETRIC, MAX_BARS, PMF_TAIL, POISSON,
+    aggregate_bars, bar_widths, get_model, plan_bars, pmf_window,
+)
+
+RECURRENCES = [
+    (BINOMIAL, stats.binom, {'n': 10, 'p': 0.5}),
+    (BINOMIAL, stats.binom, {'n': 10**6, 'p': 0.03}),
+    (BINOMIAL, stats.binom, {'n': 50, 'p': 0.99}),
+    (POISSON, stats.poisson, {'lambda_': 0.1}),
+    (POISSON, stats.poisson, {'lambda_': 1000.0}),
+    (GEOMETRIC, stats.geom, {'p': 0.01}),
+    (GEOMETRIC, stats.geom, {'p': 0.7}),
+    (HYPERGEOMETRIC, stats.hypergeom, {'N': 50, 'K': 20, 'n': 10}),
+    (HYPERGEOMETRIC, stats.hypergeom, {'N': 10**6, 'K': 3 * 10**5, 'n': 10**4}),
+]
+
+
+@pytest.mark.parametrize('recurrence, family, params', RECURRENCES)
+def test_recurrence_pmf_matches_scipy_over_the_window(recurrence, family, params):
+    rv = family(*params.values())
+    low, high = pmf_window(rv)
+    k, pmf = recurrence.pmf(low, high, **params)
+    np.testing.assert_array_equal(k, np.arange(low, high + 1))
+    assert pmf.sum() == pytest.approx(1)
+    np.testing.assert_allclose(pmf, rv.pmf(k), rtol=1e-9, atol=2 * PMF_TAIL)
+
+
+@pytest.mark.parametrize('recurrence, family, params', RECURRENCES)
+def test_plan_bars_keep_the_mass_within_max_bars(recurrence, family, params):
+    x, y = plan_bars(family(*params.values()), recurrence, **params)
+    assert len(x) <= MAX_BARS
+    assert y.sum() == pytest.approx(1)
+    assert np.all(np.diff(x) > 0)
+
+
+def test_wide_window_is_precise_at_the_mode():
+    # Summed forwards from k = 0 the ratios reach ~7e5 at the mode and lose ~1e-10 relative precision there
+    k, pmf = BINOMIAL.pmf(0, 10**6, n=10**6, p=0.5)
+    near_mode = slice(5 * 10**5 - 100, 5 * 10**5 + 100)
+    np.testing.assert_allclose(pmf[near_mode], stats.binom.pmf(k[near_mode], 10**6, 0.5), rtol=1e-12)
+
+
+def test_geometric_at_p_1_is_a_point_mass_without_warnings():
+    model = get_model('geometric')
+    with warnings.catch_warnings():
+        warnings.simplefilter('error')
+        x, pmf = model.density(p=1.0)
+        result = model.evaluate(p=1.0, quantiles=[0.5])
+    np.testing.assert_array_equal(x, [1])
+    np.testing.assert_array_equal(pmf, [1])
+    np.testing.assert_array_equal(result['cdf'], [1])
+
+
+def test_aggregate_bars_without_aggregation_returns_the_input():
+    x, y = np.arange(5, 5 + MAX_BARS), np.full(MAX_BARS, 1 / MAX_BARS)
+    centres, masses = aggregate_bars(x, y)
+    np.testing.assert_array_equal(centres, x)
+    np.testing.assert_array_equal(masses, y)
+
+
+def test_short_last_bar_is_centred_on_its_own_values():
+    # 1001 values at width 6 make 166 full bars and one of 5 values
+    x = np.arange(10, 1011)
+    centres, masses = aggregate_bars(x, np.ones(len(x)))
+    widths = bar_widths(centres)
+    assert len(centres) == 167
+    np.testing.assert_array_equal(masses[:-1], 6)
+    assert masses[-1] == 5
+    np.testing.assert_array_equal(widths[:-1], 6)
+    assert widths[-1] == 5
+    assert centres[0] == 12.5
+    assert centres[-1] == 1008
+    # The bars tile [x[0] - 1/2, x[-1] + 1/2] without gaps or overlaps
+    np.testing.assert_allclose(centres[1:] - widths[1:] / 2, centres[:-1] + widths[:-1] / 2)
+    assert centres[0] - widths[0] / 2 == x[0] - 0.5
+    assert centres[-1] + widths[-1] / 2 == x[-1] + 0.5
+
+
+def test_full_last_bar_keeps_the_common_width():
+    x = np.arange(1200)
+    centres, masses = aggregate_bars(x, np.ones(len(x)))
+    np.testing.assert_array_equal(bar_widths(centres), 6)
+    np.testing.assert_array_equal(masses, 6)
@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+from experiments.basic.dice_experiment import alias_table, dice_sums_chunk, face_probabilities, sum_distribution
+
+
+@pytest.mark.parametrize('faces, num_dice, weights', [
+    (6, 1, None),
+    (6, 3, None),
+    (6, 10, [1, 1, 1, 1, 1, 3]),
+    (20, 25, None),
+    (4, 100, [4, 3, 2, 1]),
+])
+def test_fft_pmf_matches_repeated_convolution(faces, num_dice, weights):
+    probabilities = face_probabilities(faces, weights)
+    expected = np.ones(1)
+    for _ in range(num_dice):
+        expected = np.convolve(expected, probabilities)
+    distribution = sum_distribution(probabilities, num_dice)
+    assert distribution.low == num_dice
+    np.testing.assert_allclose(distribution.pmf, expected, rtol=0, atol=num_dice * 1e-16)
+
+
+def test_sum_distribution_moments():
+    distribution = sum_distribution(face_probabilities(6), 4)
+    assert distribution.mean == pytest.approx(14)
+    assert distribution.variance == pytest.approx(4 * 35 / 12)
+
+
+@pytest.mark.parametrize('pmf', [
+    np.full(6, 1 / 6),
+    np.array([0.5, 0.25, 0.125, 0.125]),
+    np.array([0.0, 0.7, 0.0, 0.3]),
+    sum_distribution(face_probabilities(6), 7).pmf,
+])
+def test_alias_table_reproduces_the_pmf(pmf):
+    threshold, alias = alias_table(pmf)
+    # Index i is picked with probability 1/n, then kept with threshold[i] or replaced by alias[i]
+    implied = (threshold + np.bincount(alias, weights=1 - threshold, minlength=len(pmf))) / len(pmf)
+    np.testing.assert_allclose(implied, pmf, rtol=0, atol=1e-12)
+
+
+@pytest.mark.parametrize('faces, num_dice, weights', [
+    (6, 1, None),
+    (6, 2, None),
+    (6, 3, [1, 1, 1, 1, 1, 3]),
+    (4, 5, [0, 1, 0, 2]),
+])
+def test_rolled_dice_match_the_exact_pmf(faces, num_dice, weights):
+    probabilities = face_probabilities(faces, weights)
+    distribution = sum_distribution(probabilities, num_dice)
+    num_rolls = 10**6
+    counts = dice_sums_chunk(probabilities, num_dice, num_rolls, 0)
+    assert counts.sum() == num_rolls
+    assert len(counts) == len(distribution.pmf)
+    standard_error = np.sqrt(distribution.pmf * (1 - distribution.pmf) / num_rolls)
+    assert np.all(np.abs(counts / num_rolls - distribution.pmf) <= 5 * standard_error)
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+from scipy import stats
+from distributions.properties import CLOSED_FORMS, MOMENTS, QUANTILES, properties, tabulate
+
+CASES = [
+    ('normal', {'mean': 1.5, 'std': 2.0}, stats.norm(1.5, 2.0)),
+    ('gamma', {'alpha': 2.5, 'beta': 1.5}, stats.gamma(2.5, scale=1.5)),
+    ('binomial', {'n': 40, 'p': 0.3}, stats.binom(40, 0.3)),
+    ('poisson', {'lambda_': 7.5}, stats.poisson(7.5)),
+    ('hypergeometric', {'N': 50, 'K': 20, 'n': 10}, stats.hypergeom(50, 20, 10)),
+]
+
+
+def expected(rv):
+    mean, variance, skewness, kurtosis = (float(value) for value in rv.stats('mvsk'))
+    return {'mean': mean, 'variance': variance, 'skewness': skewness, 'kurtosis': kurtosis, 'entropy': float(rv.entropy())}
+
+
+@pytest.mark.parametrize('name, params, rv', CASES)
+def test_properties_match_scipy(name, params, rv):
+    result = properties(name, **params)
+    for moment, value in expected(rv).items():
+        assert result[moment] == pytest.approx(value, rel=1e-9, abs=1e-12), moment
+    np.testing.assert_allclose(list(result['quantiles'].values()), rv.ppf(QUANTILES))
+    assert result['support'] == tuple(float(bound) for bound in rv.support())
+
+
+@pytest.mark.parametrize('name, params, rv', [
+    ('binomial', {'n': 40, 'p': 0.3}, stats.binom(40, 0.3)),
+    ('geometric', {'p': 0.2}, stats.geom(0.2)),
+])
+def test_discrete_fallback_matches_scipy(name, params, rv, monkeypatch):
+    # Without its closed form every moment is summed over the support window, which drops TAIL mass
+    monkeypatch.delitem(CLOSED_FORMS, name)
+    result = tabulate(name, **params)
+    for moment, value in expected(rv).items():
+        assert float(result[moment]) == pytest.approx(value, rel=1e-7), moment
+
+
+# Quadrature in quantile space under-weights the tails, more so for higher moments
+QUADRATURE_TOLERANCE = {'mean': 1e-4, 'variance': 1e-3, 'skewness': 1e-2, 'kurtosis': 2e-2, 'entropy': 1e-4}
+
+
+@pytest.mark.parametrize('name, params, rv', [
+    ('gamma', {'alpha': 2.5, 'beta': 1.5}, stats.gamma(2.5, scale=1.5)),
+    ('exponential', {'rate': 0.5}, stats.expon(scale=2.0)),
+])
+def test_continuous_fallback_matches_scipy(name, params, rv, monkeypatch):
+    monkeypatch.delitem(CLOSED_FORMS, name)
+    result = tabulate(name, **params)
+    for moment, value in expected(rv).items():
+        assert float(result[moment]) == pytest.approx(value, rel=QUADRATURE_TOLERANCE[moment]), moment
+
+
+def test_tabulate_broadcasts_over_parameter_arrays():
+    n = np.array([[10], [200]])
+    p = np.array([0.1, 0.5, 0.9])
+    result = tabulate('binomial', n=n, p=p)
+    assert result['quantiles'].shape == (2, 3, len(QUANTILES))
+    for i, j in np.ndindex(2, 3):
+        rv = stats.binom(n[i, 0], p[j])
+        for moment, value in expected(rv).items():
+            assert result[moment][i, j] == pytest.approx(value, rel=1e-9, abs=1e-12), moment
+
+
+def test_properties_are_memoized():
+    assert properties('poisson', lambda_=3.0) is properties('poisson', lambda_=3.0)
+    assert set(MOMENTS) <= set(properties('poisson', lambda_=3.0))
@@ -0,0 +1,29 @@
+import numpy as np
+import pytest
+from scipy import stats
+from experiments.backend import chunk_generator
+from experiments.basic.t_test import analytic_power, power_grid, rejections_chunk
+
+SEED = 12345
+
+
+@pytest.mark.parametrize('alpha', [0.01, 0.05, 0.1])
+def test_rejections_match_scipy_ttest_ind_on_the_same_draws(alpha):
+    sample_sizes, effect_sizes = power_grid(60, 1.0, sizes=4, effects=5)
+    num_replications = 500
+    rejections = rejections_chunk(sample_sizes, effect_sizes, alpha, num_replications, SEED)
+
+    # The same draws, in the order rejections_chunk makes them
+    rng = chunk_generator(SEED)
+    for i, n in enumerate(sample_sizes):
+        noise = rng.standard_normal((2, num_replications, n), dtype=np.float32).astype(np.float64)
+        for j, effect_size in enumerate(effect_sizes):
+            p_values = stats.ttest_ind(noise[0], noise[1] + effect_size, axis=1).pvalue
+            assert rejections[i, j] == np.count_nonzero(p_values < alpha)
+
+
+def test_analytic_power_is_alpha_without_effect():
+    sample_sizes, effect_sizes = power_grid(200, 1.0)
+    power = analytic_power(sample_sizes, effect_sizes, 0.05)
+    np.testing.assert_allclose(power[:, 0], 0.05)
+    assert np.all(np.diff(power, axis=1) > 0)
@@ -0,0 +1,47 @@
+import os
+from contextlib import contextmanager
+from matplotlib.figure import Figure
+import streamlit as st
+from instrumentation import phase
+
+POOL_SIZE = 4
+PLOT_BACKEND_ENV = 'PROBABILITY_EXPLORER_PLOT_BACKEND'
+PLOT_BACKENDS = ('matplotlib', 'vega-lite')
+
+
+def plot_backend():
+    """'matplotlib' (server-side PNG, the default) or 'vega-lite' (rendered in the browser)"""
+    name = os.environ.get(PLOT_BACKEND_ENV, 'matplotlib')
+    if name not in PLOT_BACKENDS:
+        raise ValueError(f"Unknown plot backend: {name}")
+    return name
+
+
+@contextmanager
+def session_figure():
+    """Yield (fig, ax) from the session's figure pool, render it with st.pyplot and release it.
+
+    Figures are created through the object-oriented Figure API, so they are never
+    registered with pyplot's global figure manager and can be reused across reruns.
+    With the vega-lite backend, (fig, ax) record the plot calls instead and the
+    resulting spec is drawn by the browser.
+    """
+    if plot_backend() == 'vega-lite':
+        from .vega import VegaFigure
+        fig = VegaFigure()
+        yield fig, fig.add_subplot()
+        with phase('encode'):
+            st.vega_lite_chart(fig.axes.spec(), use_container_width=True)
+        return
+
+    pool = st.session_state.setdefault('figure_pool', [])
+    fig = pool.pop() if pool else Figure()
+    ax = fig.add_subplot()
+    try:
+        yield fig, ax
+        with phase('encode'):
+            st.pyplot(fig)
+    finally:
+        fig.clear()
+        if len(pool) < POOL_SIZE:
+            pool.append(fig)
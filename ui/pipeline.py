@@ -0,0 +1,64 @@
+"""Memoized stages from slider values to what a distribution page shows.
+
+    params ──► arrays ──► figure ──► bytes
+       └─────────────────────────────────► properties
+
+Each stage is memoized on its inputs, so a rerun recomputes only the stages
+downstream of an input that changed:
+
+    arrays      Distribution.evaluate_model(), in distributions.base.evaluation_cache
+    figure      drawn only on a bytes miss; a Figure is never kept
+    bytes       plot_image(), in plot_cache (and the on-disk render cache, if configured)
+    properties  distributions.properties.properties()
+
+A rerun that changes no parameter, e.g. one that only toggles auto-update,
+reads every stage from memory and calls neither scipy nor matplotlib.
+Streamlit still needs every element sent again on each run, which is cheap
+for cached values.
+"""
+import json
+import streamlit as st
+from distributions.compute import LRUCache, freeze
+from instrumentation import phase
+from .figures import plot_backend
+from .render_cache import get_render_cache, render
+
+
+class PlotCache(LRUCache):
+    """LRU cache of rendered plots: (format, data) pairs, sized by the length of data"""
+
+    def prepare(self, value):
+        return value, len(value[1])
+
+
+plot_cache = PlotCache(max_entries=512, max_bytes=64 * 2**20)
+
+
+def _render_plot(name, distribution, backend):
+    if backend == 'vega-lite':
+        from .vega import VegaFigure
+        fig = VegaFigure()
+        with phase('figure'):
+            distribution.plot(fig.add_subplot())
+        # Kept as text so a cached spec cannot be changed by whoever displays it
+        with phase('encode'):
+            return 'vega-lite', json.dumps(fig.axes.spec())
+    render_cache = get_render_cache()
+    if render_cache is not None:
+        return render_cache.image_format, render_cache.get_or_render(name, distribution)
+    return 'png', render(distribution)
+
+
+def plot_image(name, distribution, params):
+    """The distribution's plot for params as (format, data), rendered only if no stage has it"""
+    backend = plot_backend()
+    key = (name, backend, freeze(params))
+    return plot_cache.get_or_compute(key, lambda: _render_plot(name, distribution, backend))
+
+
+def show_plot(image):
+    image_format, data = image
+    if image_format == 'vega-lite':
+        st.vega_lite_chart(json.loads(data), use_container_width=True)
+    else:
+        st.image(data.decode() if image_format == 'svg' else data, use_container_width=True)
@@ -0,0 +1,300 @@
+"""On-disk cache of rendered distribution plots.
+
+Every slider has a fixed step, so a distribution's plots form a finite set
+indexed by the step number of each slider value. Rendered images are stored
+under <directory>/<code version>/ and looked up by distribution name plus
+those indices. The code version hashes the plotting code and the matplotlib
+version, so editing a plot starts a fresh cache and drops the old one.
+Files are evicted least-recently-used first once max_bytes is exceeded.
+
+The cache is off unless PROBABILITY_EXPLORER_RENDER_CACHE names a directory.
+Fill it ahead of time with
+
+    python -m ui.render_cache Normal Binomial --limit 2000
+
+or in the app process by listing distributions in
+PROBABILITY_EXPLORER_RENDER_WARMUP (comma-separated).
+"""
+import argparse
+import hashlib
+import io
+import itertools
+import json
+import logging
+import os
+import re
+import shutil
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+import matplotlib
+from matplotlib.figure import Figure
+import streamlit as st
+from instrumentation import phase
+
+CACHE_ENV = 'PROBABILITY_EXPLORER_RENDER_CACHE'
+MAX_MB_ENV = 'PROBABILITY_EXPLORER_RENDER_CACHE_MB'
+FORMAT_ENV = 'PROBABILITY_EXPLORER_RENDER_FORMAT'
+WARMUP_ENV = 'PROBABILITY_EXPLORER_RENDER_WARMUP'
+
+# Same options st.pyplot uses, so cached and live plots look identical
+SAVEFIG_OPTIONS = {'bbox_inches': 'tight', 'dpi': 200}
+# Step Streamlit uses for sliders declared without one
+DEFAULT_STEPS = {int: 1, float: 0.01}
+
+ROOT = Path(__file__).resolve().parent.parent
+VERSIONED_SOURCES = ['distributions', 'ui/figures.py', 'ui/render_cache.py']
+
+# Names code_version() gives version directories; nothing else under the root is removed
+VERSION_PATTERN = re.compile(r'[0-9a-f]{16}')
+
+logger = logging.getLogger(__name__)
+
+
+def code_version():
+    """Hash of the plotting code and matplotlib version; a change invalidates every cached image"""
+    digest = hashlib.sha256(matplotlib.__version__.encode())
+    for source in VERSIONED_SOURCES:
+        path = ROOT / source
+        for file in sorted(path.rglob('*.py')) if path.is_dir() else [path]:
+            digest.update(str(file.relative_to(ROOT)).encode())
+            digest.update(file.read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def step_of(parameter):
+    return parameter.step or DEFAULT_STEPS[type(parameter.value)]
+
+
+def quantize(distribution, values):
+    """Slider values as step indices from each slider's minimum, immune to float noise"""
+    return {
+        parameter.name: round((values[parameter.name] - parameter.min_value) / step_of(parameter))
+        for parameter in distribution.parameters
+    }
+
+
+class SliderGrid(Sequence):
+    """Every value the slider can take, nearest to its default first.
+
+    Values are computed from their rank on access, as sliders may have
+    millions of steps (the binomial n goes up to 10**7).
+    """
+
+    def __init__(self, parameter):
+        self.parameter = parameter
+        self.step = step_of(parameter)
+        self.count = round((parameter.max_value - parameter.min_value) / self.step) + 1
+        self.default = min(max(round((parameter.value - parameter.min_value) / self.step), 0), self.count - 1)
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, rank):
+        if not 0 <= rank < self.count:
+            raise IndexError(rank)
+        below, above = self.default, self.count - 1 - self.default
+        if rank <= 2 * min(below, above):
+            # Alternate below and above the default, lower first on ties
+            offset = (rank + 1) // 2
+            index = self.default - offset if rank % 2 else self.default + offset
+        elif below > above:
+            index = self.default - (rank - above)
+        else:
+            index = self.default + (rank - below)
+        value = self.parameter.min_value + index * self.step
+        return round(value, 10) if isinstance(self.parameter.value, float) else value
+
+
+def parameter_space(distribution):
+    """All slider value combinations, ordered by total distance (in steps) from the defaults.
+
+    Visitors mostly move a slider or two away from the defaults, so a warm-up
+    cut short by a limit still covers the most requested plots.
+    """
+    grids = [SliderGrid(parameter) for parameter in distribution.parameters]
+    names = [parameter.name for parameter in distribution.parameters]
+    sizes = [len(grid) for grid in grids]
+    for total in range(sum(size - 1 for size in sizes) + 1):
+        for rank in _ranks_summing_to(total, sizes):
+            yield {name: grid[i] for name, grid, i in zip(names, grids, rank)}
+
+
+def _ranks_summing_to(total, sizes):
+    if not sizes:
+        if total == 0:
+            yield ()
+        return
+    if total > sum(size - 1 for size in sizes):
+        return
+    for first in range(min(total, sizes[0] - 1) + 1):
+        for rest in _ranks_summing_to(total - first, sizes[1:]):
+            yield (first,) + rest
+
+
+def render(distribution, image_format='png'):
+    """Image bytes of distribution.plot for its current parameters"""
+    fig = Figure()
+    with phase('figure'):
+        distribution.plot(fig.add_subplot())
+    buffer = io.BytesIO()
+    with phase('encode'):
+        fig.savefig(buffer, format=image_format, **SAVEFIG_OPTIONS)
+    return buffer.getvalue()
+
+
+class RenderCache:
+    def __init__(self, directory, max_bytes=256 * 2**20, image_format='png', version=None):
+        self.root = Path(directory)
+        self.max_bytes = max_bytes
+        self.image_format = image_format
+        self.version = version or code_version()
+        self.directory = self.root / self.version
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._drop_stale_versions()
+        self._bytes = None  # running total between directory scans
+
+    def _drop_stale_versions(self):
+        """Remove other code versions' directories, leaving anything else under the root alone"""
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name != self.version and VERSION_PATTERN.fullmatch(path.name):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def path(self, name, indices):
+        key = json.dumps([name, sorted(indices.items())])
+        return self.directory / f'{hashlib.sha256(key.encode()).hexdigest()}.{self.image_format}'
+
+    def get(self, name, indices):
+        path = self.path(name, indices)
+        try:
+            data = path.read_bytes()
+        except FileNotFoundError:
+            return None
+        os.utime(path)  # mtime doubles as the LRU timestamp
+        return data
+
+    def put(self, name, indices, data):
+        path = self.path(name, indices)
+        # Write then rename, so a concurrent reader never sees half a file
+        partial = path.with_name(f'{path.name}.{threading.get_ident()}.tmp')
+        partial.write_bytes(data)
+        partial.replace(path)
+        with self._lock:
+            self._bytes = self._bytes + len(data) if self._bytes is not None else None
+            over = self._bytes is None or self._bytes > self.max_bytes
+        if over:
+            self.evict()
+
+    def evict(self):
+        """Rescan the directory and delete least-recently-used files down to max_bytes"""
+        with self._lock:
+            files = []
+            for path in self.directory.glob(f'*.{self.image_format}'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((stat.st_mtime, stat.st_size, path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files, key=lambda file: file[0]):
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+            self._bytes = total
+
+    def stats(self):
+        sizes = [path.stat().st_size for path in self.directory.glob(f'*.{self.image_format}')]
+        return {'version': self.version, 'entries': len(sizes), 'bytes': sum(sizes)}
+
+    def get_or_render(self, name, distribution):
+        """Cached image for the distribution's current slider values, rendering it on a miss"""
+        indices = quantize(distribution, distribution.slider_values)
+        data = self.get(name, indices)
+        if data is None:
+            data = render(distribution, self.image_format)
+            self.put(name, indices, data)
+        return data
+
+    def warm_up(self, name, distribution, limit=None):
+        """Render up to limit parameter combinations nearest the defaults, returning how many were new"""
+        rendered = 0
+        for values in itertools.islice(parameter_space(distribution), limit):
+            indices = quantize(distribution, values)
+            if self.path(name, indices).exists():
+                continue
+            distribution.assumed_values = values
+            try:
+                distribution.get_parameters()
+            except ValueError:
+                continue  # outside a dependent bound, e.g. K > N for the hypergeometric
+            finally:
+                distribution.assumed_values = {}
+            try:
+                self.put(name, indices, render(distribution, self.image_format))
+            except RuntimeError as e:
+                logger.debug('Skipping %s %s: %s', name, values, e)
+                continue
+            rendered += 1
+        return rendered
+
+
+def cache_from_env():
+    directory = os.environ.get(CACHE_ENV)
+    if not directory:
+        return None
+    max_mb = float(os.environ.get(MAX_MB_ENV, 256))
+    return RenderCache(directory, int(max_mb * 2**20), os.environ.get(FORMAT_ENV, 'png'))
+
+
+def start_warm_up(cache, registry, names, limit=None):
+    """Fill the cache for names in a daemon thread"""
+    def run():
+        for name in names:
+            rendered = cache.warm_up(name, registry.distribution_class(name)(), limit)
+            logger.info('Render cache warm-up: %d new images for %s', rendered, name)
+
+    thread = threading.Thread(target=run, name='render-cache-warm-up', daemon=True)
+    thread.start()
+    return thread
+
+
+@st.cache_resource
+def get_render_cache():
+    """Process-wide cache from the environment, or None; starts the configured warm-up once"""
+    cache = cache_from_env()
+    names = [name for name in os.environ.get(WARMUP_ENV, '').split(',') if name]
+    if cache is not None and names:
+        from registry import get_registry
+        start_warm_up(cache, get_registry(), names)
+    return cache
+
+
+def main(argv=None):
+    from registry import Registry
+
+    parser = argparse.ArgumentParser(description='Pre-render distribution plots into the render cache.')
+    parser.add_argument('names', nargs='*', help='distributions to warm up (default: all)')
+    parser.add_argument('--directory', default=os.environ.get(CACHE_ENV), help=f'cache directory (default: ${CACHE_ENV})')
+    parser.add_argument('--max-mb', type=float, default=float(os.environ.get(MAX_MB_ENV, 256)))
+    parser.add_argument('--format', choices=['png', 'svg'], default=os.environ.get(FORMAT_ENV, 'png'))
+    parser.add_argument('--limit', type=int, help='parameter combinations per distribution')
+    args = parser.parse_args(argv)
+    if not args.directory:
+        parser.error(f'--directory or ${CACHE_ENV} is required')
+
+    # get_parameters() runs outside a Streamlit session here, where its st calls are no-ops
+    logging.disable(logging.WARNING)
+    registry = Registry()
+    cache = RenderCache(args.directory, int(args.max_mb * 2**20), args.format)
+    names = args.names or registry.names('continuous') + registry.names('discrete')
+    for name in names:
+        rendered = cache.warm_up(name, registry.distribution_class(name)(), args.limit)
+        print(f'{name:20s} {rendered} new images')
+    stats = cache.stats()
+    print(f"{stats['entries']} images, {stats['bytes'] / 2**20:.1f} MiB in {cache.directory}")
+
+
+if __name__ == '__main__':
+    main()
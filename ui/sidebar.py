@@ -1,4 +1,13 @@
 import streamlit as st
+from experiments.rng import SEED_KEY, new_seed, session_rng
+from registry import get_registry
+
+PAGE_ICONS = {
+    "Continuous Distributions": "📈",
+    "Discrete Distributions": "📊",
+    "Experiments": "🧪",
+    "About": "👤",
+}
 
 class Sidebar:
     @staticmethod
@@ -7,8 +16,8 @@ class Sidebar:
             st.header("🧭 Navigation")
             page = st.radio(
                 "",
-                ["Continuous Distributions", "Discrete Distributions", "Experiments", "About"],
-                format_func=lambda x: f"{'📈' if x=='Continuous Distributions' else '📊' if x=='Discrete Distributions' else '🎲' if x=='Random Variables' else '🧪' if x=='Experiments' else '👤'} {x}"
+                list(PAGE_ICONS),
+                format_func=lambda x: f"{PAGE_ICONS[x]} {x}"
             )
             
             st.markdown("---")
@@ -16,15 +25,37 @@ class Sidebar:
 
     @staticmethod
     def get_distribution_selector(distribution_type):
-        if distribution_type == "Continuous":
-            return st.selectbox(
-                'Select distribution type',
-                ['Multivariate Normal', 'Normal', 'Chi-squared','Exponential', 'Cauchy', 'Uniform', 'Gamma'],
-                format_func=lambda x: f"{x} Distribution"
-            )
-        elif distribution_type == "Discrete":
-            return st.selectbox(
-                'Select distribution type',
-                ['Multinomial', 'Poisson', 'Binomial', 'Geometric', 'Bernoulli', 'Hypergeometric', 'UniformDiscrete'],
-                format_func=lambda x: f"{x} Distribution"
-            )
\ No newline at end of file
+        return st.selectbox(
+            'Select distribution type',
+            get_registry().names(distribution_type.lower()),
+            format_func=lambda x: f"{x} Distribution"
+        )
+
+    @staticmethod
+    def show_timings(timings):
+        """Collapsible breakdown of the rerun that just finished, from instrumentation.rerun()"""
+        self_times = timings.self_times()
+        rows = {'Phase': [], 'Total (ms)': [], 'Self (ms)': []}
+        for path, seconds in timings.phases.items():
+            depth = path.count('.')
+            rows['Phase'].append('\u2003' * depth + path.rpartition('.')[2])
+            rows['Total (ms)'].append(f'{seconds * 1e3:.1f}')
+            rows['Self (ms)'].append(f'{self_times[path] * 1e3:.1f}')
+        untracked = timings.total - sum(seconds for path, seconds in timings.phases.items() if '.' not in path)
+        rows['Phase'].append('other')
+        rows['Total (ms)'].append(f'{untracked * 1e3:.1f}')
+        rows['Self (ms)'].append(f'{untracked * 1e3:.1f}')
+
+        with st.sidebar.expander(f'⏱️ Rerun timings ({timings.total * 1e3:.0f} ms)'):
+            st.table(rows)
+            if timings.profile:
+                st.code(timings.profile, language=None)
+
+    @staticmethod
+    def get_seed_selector():
+        def reseed():
+            st.session_state[SEED_KEY] = new_seed()
+
+        session_rng()  # make sure a seed exists before the widget reads it
+        st.number_input('Random seed', min_value=0, max_value=2**32 - 1, step=1, key=SEED_KEY)
+        st.button('🎲 New seed', on_click=reseed)
@@ -0,0 +1,298 @@
+"""Vega-Lite plotting backend.
+
+VegaAxes records the calls the explorer makes on matplotlib Axes (plot, bar,
+hist, contourf, ...) and turns them into one layered Vega-Lite spec, which the
+browser renders with st.vega_lite_chart. The server only computes the data:
+long series are downsampled, histograms are binned and contour grids are
+coarsened before they are sent, so a spec stays a few tens of kilobytes.
+"""
+import json
+import numpy as np
+
+# Points per line after min/max downsampling, and cells per axis for contourf
+MAX_POINTS = 2000
+MAX_CELLS = 50
+SIGNIFICANT_DIGITS = 5
+CONTOUR_DIGITS = 3
+SQUARE_SIZE = 360
+
+# matplotlib's default property cycle (tab10)
+COLOR_CYCLE = ['#1f77b4', '#ff7f0e', '#2ca02c', '#d62728', '#9467bd',
+               '#8c564b', '#e377c2', '#7f7f7f', '#bcbd22', '#17becf']
+COLOR_LETTERS = {'b': 'blue', 'g': 'green', 'r': 'red', 'c': 'cyan', 'm': 'magenta',
+                 'y': 'yellow', 'k': 'black', 'w': 'white'}
+MARKERS = {'_': 'tick', 'o': 'point', '.': 'point', 'x': 'point', 's': 'square', '^': 'triangle'}
+DASHES = {'--': [6, 4], ':': [2, 3], '-.': [6, 3, 2, 3]}
+
+
+def compact(values, digits=SIGNIFICANT_DIGITS):
+    """Round to a few significant digits relative to the largest value, as a list for JSON"""
+    values = np.asarray(values, dtype=float)
+    finite = np.abs(values[np.isfinite(values)])
+    scale = finite.max() if finite.size else 0
+    decimals = digits - int(np.floor(np.log10(scale))) if scale > 0 else 0
+    return np.round(values, max(decimals, 0)).tolist()
+
+
+def downsample(x, y, max_points=MAX_POINTS):
+    """Keep the first, last, and per-bucket min and max points, so peaks survive decimation"""
+    x, y = np.asarray(x), np.asarray(y)
+    if len(x) <= max_points:
+        return x, y
+    buckets = max_points // 2
+    size = len(y) // buckets
+    body = y[:buckets * size].reshape(buckets, size)
+    offsets = np.arange(buckets) * size
+    keep = np.concatenate([
+        [0, len(y) - 1],
+        offsets + body.argmin(axis=1),
+        offsets + body.argmax(axis=1),
+    ])
+    keep = np.unique(keep)
+    return x[keep], y[keep]
+
+
+def columns(digits=SIGNIFICANT_DIGITS, **arrays):
+    """Inline data as one row of equal-length columns, flattened by Vega-Lite in the browser"""
+    return {
+        'data': {'values': [{name: compact(values, digits) for name, values in arrays.items()}]},
+        'transform': [{'flatten': list(arrays)}],
+    }
+
+
+def parse_format(fmt):
+    """Color, Vega-Lite mark and dash of a matplotlib format string such as 'k--' or 'ro'"""
+    color = mark = dash = None
+    for style, pattern in DASHES.items():
+        if style in fmt:
+            dash = pattern
+            fmt = fmt.replace(style, '')
+    for char in fmt:
+        if char in COLOR_LETTERS:
+            color = COLOR_LETTERS[char]
+        elif char in MARKERS:
+            mark = MARKERS[char]
+    return color, mark, dash
+
+
+class ContourHandle:
+    """Returned by contourf so figure.colorbar can title the color legend"""
+
+    def __init__(self, layer):
+        self.layer = layer
+
+
+class VegaFigure:
+    def __init__(self):
+        self.axes = VegaAxes(self)
+
+    def add_subplot(self):
+        return self.axes
+
+    def colorbar(self, mappable, ax=None, label=None):
+        mappable.layer['encoding']['color']['legend'] = {'title': label}
+
+
+class VegaAxes:
+    def __init__(self, figure):
+        self.figure = figure
+        self.layers = []
+        self.labels = []  # (label, color) for the shared legend
+        self.title = None
+        self.x = {'title': None}
+        self.y = {'title': None}
+        self.show_legend = False
+        self.square = False
+        self._cycle = 0
+
+    def _next_color(self, color=None):
+        if color is not None:
+            if color[:1] == 'C' and color[1:].isdigit():
+                return COLOR_CYCLE[int(color[1:]) % len(COLOR_CYCLE)]  # matplotlib's 'CN' cycle colors
+            return COLOR_LETTERS.get(color, color)
+        color = COLOR_CYCLE[self._cycle % len(COLOR_CYCLE)]
+        self._cycle += 1
+        return color
+
+    def _add(self, layer, color, label=None, alpha=None, dash=None, stroke=False):
+        mark = layer['mark']
+        if alpha is not None:
+            mark['opacity'] = alpha
+        if dash is not None:
+            mark['strokeDash'] = dash
+        if label is None:
+            mark['stroke' if stroke else 'color'] = color
+        else:
+            self.labels.append((label, color))
+            layer.setdefault('transform', []).append({'calculate': json.dumps(label), 'as': 'series'})
+            layer['encoding']['color'] = {'field': 'series', 'type': 'nominal'}
+        self.layers.append(layer)
+        return layer
+
+    def plot(self, x, y, fmt='', label=None, alpha=None, color=None, linestyle=None, **kwargs):
+        fmt_color, mark, dash = parse_format(fmt)
+        x, y = downsample(x, y)
+        layer = {
+            **columns(x=x, y=y),
+            'mark': {'type': mark or 'line', **({'size': kwargs['markersize'] * 2} if 'markersize' in kwargs else {})},
+            'encoding': {'x': {'field': 'x', 'type': 'quantitative'}, 'y': {'field': 'y', 'type': 'quantitative'}},
+        }
+        return self._add(layer, self._next_color(color or fmt_color), label, alpha, DASHES.get(linestyle, dash))
+
+    def step(self, x, y, fmt='', where='pre', label=None, alpha=None, color=None, **kwargs):
+        layer = self.plot(x, y, fmt, label=label, alpha=alpha, color=color, **kwargs)
+        layer['mark']['interpolate'] = {'pre': 'step-before', 'post': 'step-after', 'mid': 'step'}[where]
+        return layer
+
+    def scatter(self, x, y, c=None, s=None, label=None, alpha=None):
+        step = max(1, len(x) // MAX_POINTS)
+        layer = {
+            **columns(x=np.asarray(x)[::step], y=np.asarray(y)[::step]),
+            'mark': {'type': 'circle', **({'size': s} if s is not None else {})},
+            'encoding': {'x': {'field': 'x', 'type': 'quantitative'}, 'y': {'field': 'y', 'type': 'quantitative'}},
+        }
+        return self._add(layer, self._next_color(c), label, alpha)
+
+    def bar(self, x, height, width=0.8, label=None, alpha=None, color=None):
+        x, height = list(x), np.asarray(list(height), dtype=float)
+        if x and isinstance(x[0], str):
+            layer = {
+                'data': {'values': [{'x': category, 'y': value} for category, value in zip(x, compact(height))]},
+                'mark': {'type': 'bar'},
+                'encoding': {'x': {'field': 'x', 'type': 'nominal', 'axis': {'labelAngle': 0}},
+                             'y': {'field': 'y', 'type': 'quantitative'}},
+            }
+        else:
+            x = np.asarray(x, dtype=float)
+            layer = self._rects(x - width / 2, x + width / 2, height)
+        return self._add(layer, self._next_color(color), label, alpha)
+
+    def _rects(self, left, right, height):
+        return {
+            **columns(x=left, x2=right, y=height),
+            'mark': {'type': 'rect'},
+            'encoding': {
+                'x': {'field': 'x', 'type': 'quantitative'}, 'x2': {'field': 'x2'},
+                'y': {'field': 'y', 'type': 'quantitative'}, 'y2': {'datum': 0},
+            },
+        }
+
+    def stairs(self, values, edges, fill=False, label=None, alpha=None, color=None):
+        edges = np.asarray(edges, dtype=float)
+        return self._add(self._rects(edges[:-1], edges[1:], values), self._next_color(color), label, alpha)
+
+    def hist(self, values, bins=10, density=False, label=None, alpha=None, color=None):
+        counts, edges = np.histogram(values, bins=bins, density=density)
+        return self.stairs(counts, edges, fill=True, label=label, alpha=alpha, color=color)
+
+    def fill_between(self, x, y1, y2, label=None, alpha=None, color=None):
+        layer = {
+            **columns(x=x, y=y1, y2=y2),
+            'mark': {'type': 'area'},
+            'encoding': {'x': {'field': 'x', 'type': 'quantitative'},
+                         'y': {'field': 'y', 'type': 'quantitative'}, 'y2': {'field': 'y2'}},
+        }
+        return self._add(layer, self._next_color(color), label, alpha)
+
+    def _rule(self, channel, value, color, linestyle, linewidth, label):
+        layer = {
+            'data': {'values': [{}]},
+            'mark': {'type': 'rule', **({'strokeWidth': linewidth} if linewidth else {})},
+            'encoding': {channel: {'datum': float(value)}},
+        }
+        return self._add(layer, self._next_color(color), label, dash=DASHES.get(linestyle), stroke=True)
+
+    def axhline(self, y, color=None, linestyle=None, linewidth=None, label=None):
+        return self._rule('y', y, color, linestyle, linewidth, label)
+
+    def axvline(self, x, color=None, linestyle=None, linewidth=None, label=None):
+        return self._rule('x', x, color, linestyle, linewidth, label)
+
+    def contourf(self, X, Y, Z, levels=10, cmap='viridis'):
+        """Filled contours as a coarsened heatmap colored in `levels` bands"""
+        X, Y, Z = np.asarray(X), np.asarray(Y), np.asarray(Z)
+        x = X[0] if X.ndim == 2 else X
+        y = Y[:, 0] if Y.ndim == 2 else Y
+        x_step = max(1, int(np.ceil(len(x) / MAX_CELLS)))
+        y_step = max(1, int(np.ceil(len(y) / MAX_CELLS)))
+        x, y, Z = x[::x_step], y[::y_step], Z[::y_step, ::x_step]
+        dx = np.diff(x).mean() if len(x) > 1 else 1.0
+        dy = np.diff(y).mean() if len(y) > 1 else 1.0
+        XX, YY = np.meshgrid(x, y)
+        # Only cell centers and values are sent; the browser derives the cell edges
+        layer = columns(CONTOUR_DIGITS, x=XX.ravel(), y=YY.ravel(), z=Z.ravel())
+        layer['transform'] += [
+            {'calculate': f'datum.x - {dx / 2!r}', 'as': 'x_lo'},
+            {'calculate': f'datum.x + {dx / 2!r}', 'as': 'x_hi'},
+            {'calculate': f'datum.y - {dy / 2!r}', 'as': 'y_lo'},
+            {'calculate': f'datum.y + {dy / 2!r}', 'as': 'y_hi'},
+        ]
+        layer.update({
+            'mark': {'type': 'rect'},
+            'encoding': {
+                'x': {'field': 'x_lo', 'type': 'quantitative', 'scale': {'zero': False, 'nice': False}},
+                'x2': {'field': 'x_hi'},
+                'y': {'field': 'y_lo', 'type': 'quantitative', 'scale': {'zero': False, 'nice': False}},
+                'y2': {'field': 'y_hi'},
+                'color': {'field': 'z', 'type': 'quantitative', 'legend': None,
+                          'scale': {'type': 'quantize', 'scheme': {'name': cmap, 'count': levels}}},
+            },
+        })
+        self.layers.append(layer)
+        return ContourHandle(layer)
+
+    def set_xlabel(self, label):
+        self.x['title'] = label
+
+    def set_ylabel(self, label):
+        self.y['title'] = label
+
+    def set_title(self, title):
+        self.title = title.split('\n')
+
+    def set_xscale(self, scale):
+        self.x['scale'] = {**self.x.get('scale', {}), 'type': scale}
+
+    def set_ylim(self, bottom, top):
+        self.y['scale'] = {**self.y.get('scale', {}), 'domain': [float(bottom), float(top)]}
+
+    def _ticks(self, axis, ticks, labels=None):
+        ticks = [float(tick) for tick in ticks]
+        axis['axis'] = {'values': ticks}
+        if labels is not None:
+            names = {f'{tick:g}': str(label) for tick, label in zip(ticks, labels)}
+            axis['axis']['labelExpr'] = f'{json.dumps(names)}[datum.label]'
+
+    def set_xticks(self, ticks, labels=None):
+        self._ticks(self.x, ticks, labels)
+
+    def set_yticks(self, ticks, labels=None):
+        self._ticks(self.y, ticks, labels)
+
+    def set_aspect(self, aspect):
+        self.square = aspect == 'equal'
+
+    def legend(self, **kwargs):
+        self.show_legend = True
+
+    def spec(self):
+        """The recorded plot as a layered Vega-Lite spec"""
+        domain = [label for label, _ in self.labels]
+        scale = {'domain': domain, 'range': [color for _, color in self.labels]}
+        for layer in self.layers:
+            encoding = layer['encoding']
+            for channel, settings in (('x', self.x), ('y', self.y)):
+                if 'field' in encoding.get(channel, {}):
+                    for key, value in settings.items():
+                        if value is not None:
+                            encoding[channel][key] = {**encoding[channel].get(key, {}), **value} if isinstance(value, dict) else value
+            color = encoding.get('color', {})
+            if color.get('field') == 'series':
+                color['scale'] = scale
+                color['legend'] = {'title': None} if self.show_legend else None
+        spec = {'layer': self.layers}
+        if self.title:
+            spec['title'] = {'text': self.title if len(self.title) > 1 else self.title[0]}
+        if self.square:
+            spec['width'] = spec['height'] = SQUARE_SIZE
+        return spec